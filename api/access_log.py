@@ -0,0 +1,119 @@
+"""
+Access Log Module
+Structured JSON access logging through a background writer thread so request
+threads only enqueue a record instead of performing synchronous I/O.
+"""
+
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, TextIO
+
+
+class AccessLogWriter:
+    """Queue-backed JSON-lines logger with batching, sampling and size-based rotation."""
+
+    def __init__(self, path: Optional[str] = None, sample_rate: float = 1.0,
+                 max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 batch_size: int = 256, flush_interval: float = 0.5,
+                 queue_size: int = 10000):
+        """
+        Args:
+            path (str): Log file path, or None/'-' to write to stderr
+            sample_rate (float): Fraction of successful requests to log (errors are always logged)
+            max_bytes (int): Rotate the file once it grows past this size (0 disables rotation)
+            backup_count (int): Number of rotated files to keep (access.log.1 ... .N)
+            batch_size (int): Maximum records written per batch
+            flush_interval (float): Seconds to wait for a batch to fill before flushing
+            queue_size (int): Records buffered before new ones are dropped
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+
+        self.path = None if path in (None, '-') else path
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stream: Optional[TextIO] = None
+        self._stream_size = 0
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='access-log-writer', daemon=True)
+        self._thread.start()
+
+    def log(self, record: Dict[str, Any]):
+        """Enqueue a record without blocking; the record is dropped if the queue is full."""
+        sampled_out = self.sample_rate < 1.0 and random.random() >= self.sample_rate
+        if sampled_out and record.get('status', 500) < 400:
+            return
+        record.setdefault('ts', time.time())
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 2.0):
+        """Flush pending records and stop the writer thread."""
+        self._closed.set()
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Writer loop: drain the queue in batches and write them in one call."""
+        while not (self._closed.is_set() and self._queue.empty()):
+            batch: List[Dict[str, Any]] = []
+            try:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if batch:
+                self._write_batch(batch)
+
+        if self._stream is not None and self._stream is not sys.stderr:
+            self._stream.close()
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        """Serialize and write a batch, rotating the file if it grew too large."""
+        data = ''.join(json.dumps(record, separators=(',', ':'), default=str) + '\n'
+                       for record in batch)
+        try:
+            stream = self._open_stream()
+            stream.write(data)
+            stream.flush()
+            self._stream_size += len(data)
+            if self.path and self.max_bytes and self._stream_size >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            print(f"Access log write failed: {e}", file=sys.stderr)
+
+    def _open_stream(self) -> TextIO:
+        """Open the log destination lazily on the writer thread."""
+        if self._stream is None:
+            if self.path is None:
+                self._stream = sys.stderr
+            else:
+                self._stream = open(self.path, 'a', encoding='utf-8')
+                self._stream_size = os.path.getsize(self.path)
+        return self._stream
+
+    def _rotate(self):
+        """Shift access.log -> access.log.1 -> ... -> access.log.N."""
+        self._stream.close()
+        self._stream = None
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
@@ -0,0 +1,228 @@
+"""
+Partition Archive Module
+Time-partitioned on-disk storage for old transactions. Records are grouped by
+the day or month of their timestamp into gzip-compressed NDJSON segment files.
+Per-partition metadata (record count, min/max timestamp and ID) lets ID
+lookups and time-range scans skip every partition that cannot match.
+"""
+
+import functools
+import gzip
+import json
+import os
+import re
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Partition granularity -> length of the ISO 8601 timestamp prefix used as key
+GRANULARITIES = {'day': 10, 'month': 7}
+
+_KEY_PATTERN = re.compile(r'\d{4}-\d{2}(-\d{2})?$')
+
+# Names of the files _write_segment creates: <key>.<generation>.ndjson.gz(.tmp)
+_SEGMENT_PATTERN = re.compile(r'\d{4}-\d{2}(-\d{2})?\.\d+\.ndjson\.gz(\.tmp)?')
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an ISO 8601 timestamp to epoch seconds (naive times are UTC).
+
+    Returns:
+        Optional[float]: Epoch seconds, or None if the value is empty or malformed
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class PartitionArchive(Mapping):
+    """Read-only mapping of transaction ID to record over archived partitions."""
+
+    def __init__(self, directory: str, granularity: str = 'month', cache_segments: int = 4):
+        """
+        Args:
+            directory (str): Where segment files and the manifest are written
+            granularity (str): 'day' or 'month'
+            cache_segments (int): Decoded segments kept in memory for ID lookups
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown partition granularity: {granularity}")
+        self.directory = directory
+        self.granularity = granularity
+        # key -> metadata; replaced as a whole on every write so readers never
+        # see a half-updated manifest
+        self.partitions: Dict[str, Dict[str, Any]] = {}
+        self._load_segment = functools.lru_cache(maxsize=cache_segments)(self._read_segment)
+
+        os.makedirs(directory, exist_ok=True)
+        if not self._owns_manifest():
+            raise ValueError(f"{os.path.join(directory, MANIFEST_FILE)} was not written by a partition archive")
+        self._remove_stale_segments()
+
+    def partition_key(self, transaction: Dict[str, Any]) -> Optional[str]:
+        """Partition a record belongs to, or None if its timestamp is unusable."""
+        key = (transaction.get('timestamp') or '')[:GRANULARITIES[self.granularity]]
+        return key if _KEY_PATTERN.match(key) else None
+
+    def __getitem__(self, transaction_id: int) -> Dict[str, Any]:
+        key = self.partition_of(transaction_id)
+        if key is None:
+            raise KeyError(transaction_id)
+        return self._segment(key)[transaction_id]
+
+    def __contains__(self, transaction_id: object) -> bool:
+        return self.partition_of(transaction_id) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        for transaction_id, _ in self.items():
+            yield transaction_id
+
+    def __len__(self) -> int:
+        return sum(meta['count'] for meta in self.partitions.values())
+
+    def partition_of(self, transaction_id) -> Optional[str]:
+        """Find the partition holding an ID, reading only partitions whose ID range covers it."""
+        for key, meta in self.partitions.items():
+            if meta['min_id'] <= transaction_id <= meta['max_id'] and transaction_id in self._segment(key):
+                return key
+        return None
+
+    def items(self, since: Optional[float] = None, until: Optional[float] = None
+              ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield (id, record) in partition order, skipping partitions outside [since, until].
+
+        Segments are streamed from disk without going through the lookup cache.
+        """
+        for key, meta in sorted(self.partitions.items()):
+            if since is not None and meta['max_ts'] is not None and meta['max_ts'] < since:
+                continue
+            if until is not None and meta['min_ts'] is not None and meta['min_ts'] > until:
+                continue
+            with gzip.open(meta['path'], 'rt', encoding='utf-8') as f:
+                for line in f:
+                    transaction = json.loads(line)
+                    yield transaction['id'], transaction
+
+    def items_between(self, since: Optional[float], until: Optional[float]
+                      ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Partition-pruned items() used for time-range queries."""
+        return self.items(since, until)
+
+    def stage_partitions(self, updates: Dict[str, Dict[int, Optional[Dict[str, Any]]]]
+                         ) -> Tuple[Dict[str, Dict[str, Any]], int]:
+        """
+        Merge changes into partitions and write their new segment files.
+
+        Nothing is visible to readers until the result is passed to
+        publish_partitions(); callers serialize stage/publish pairs.
+
+        Args:
+            updates: partition key -> {id: record, or None to delete}
+
+        Returns:
+            Tuple: (partition metadata to publish, records written across the new segments)
+        """
+        written = 0
+        partitions = dict(self.partitions)
+        for key, changes in updates.items():
+            records = dict(self._segment(key)) if key in partitions else {}
+            for transaction_id, transaction in changes.items():
+                if transaction is None:
+                    records.pop(transaction_id, None)
+                else:
+                    records[transaction_id] = transaction
+            if records:
+                partitions[key] = self._write_segment(key, records, partitions.get(key))
+                written += len(records)
+            else:
+                partitions.pop(key, None)
+        return partitions, written
+
+    def publish_partitions(self, partitions: Dict[str, Dict[str, Any]]):
+        """Make staged partitions visible and remove segments of dropped partitions."""
+        dropped = [meta for key, meta in self.partitions.items() if key not in partitions]
+        self.partitions = partitions
+        self._write_manifest()
+        for meta in dropped:
+            os.remove(meta['path'])
+
+    def _segment(self, key: str) -> Dict[int, Dict[str, Any]]:
+        """Decoded segment for a partition, cached per segment generation."""
+        meta = self.partitions[key]
+        return self._load_segment(meta['path'], meta['generation'])
+
+    @staticmethod
+    def _read_segment(path: str, generation: int) -> Dict[int, Dict[str, Any]]:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return {transaction['id']: transaction for transaction in map(json.loads, f)}
+
+    def _write_segment(self, key: str, records: Dict[int, Dict[str, Any]],
+                       previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Write a segment atomically and return its metadata."""
+        generation = previous['generation'] + 1 if previous else 1
+        path = os.path.join(self.directory, f"{key}.{generation}.ndjson.gz")
+        with gzip.open(path + '.tmp', 'wt', encoding='utf-8') as f:
+            for transaction in records.values():
+                f.write(json.dumps(transaction, separators=(',', ':')) + '\n')
+        os.replace(path + '.tmp', path)
+
+        timestamps = [ts for ts in (parse_timestamp(t.get('timestamp')) for t in records.values())
+                      if ts is not None]
+        # The previous generation stays on disk until the next rewrite; older
+        # snapshots may still be streaming it
+        if previous and previous['previous_path'] and os.path.exists(previous['previous_path']):
+            os.remove(previous['previous_path'])
+        return {
+            'path': path,
+            'previous_path': previous['path'] if previous else None,
+            'generation': generation,
+            'count': len(records),
+            'min_ts': min(timestamps, default=None),
+            'max_ts': max(timestamps, default=None),
+            'min_id': min(records),
+            'max_id': max(records),
+            'bytes': os.path.getsize(path)
+        }
+
+    def _write_manifest(self):
+        """Persist partition metadata next to the segments for inspection."""
+        manifest = {'granularity': self.granularity, 'partitions': self.partitions}
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(path + '.tmp', path)
+
+    def _remove_stale_segments(self):
+        """
+        Delete segments left by a previous run (the archive is rebuilt on startup).
+
+        Only files named like the segments this class writes and not referenced
+        by the current partitions are removed; other files are left alone.
+        """
+        live = {os.path.basename(path) for meta in self.partitions.values()
+                for path in (meta['path'], meta['previous_path']) if path}
+        for name in os.listdir(self.directory):
+            if _SEGMENT_PATTERN.fullmatch(name) and name not in live:
+                os.remove(os.path.join(self.directory, name))
+        self._write_manifest()
+
+    def _owns_manifest(self) -> bool:
+        """True if manifest.json is absent or was written by _write_manifest."""
+        try:
+            with open(os.path.join(self.directory, MANIFEST_FILE), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return True
+        except (OSError, ValueError):
+            return False
+        return isinstance(manifest, dict) and set(manifest) == {'granularity', 'partitions'}
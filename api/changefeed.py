@@ -0,0 +1,71 @@
+"""
+Change Feed Module
+In-memory ring buffer of transaction change events for Server-Sent Events
+subscribers. Each event is serialized once into an SSE frame when it is
+published; every subscriber reads the same immutable bytes objects, so the
+cost of a commit does not grow with the number of open streams.
+"""
+
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Store change kind -> SSE event name
+EVENT_NAMES = {'insert': 'created', 'replace': 'updated', 'remove': 'deleted'}
+
+
+class ChangeFeed:
+    """Bounded, resumable sequence of SSE frames with blocking reads."""
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Args:
+            capacity (int): Most recent events kept for Last-Event-ID resumption
+        """
+        if capacity < 1:
+            raise ValueError("Change feed capacity must be at least 1")
+        self.capacity = capacity
+        self.last_id = 0  # ID of the newest event; event IDs start at 1
+        self._frames: List[Optional[bytes]] = [None] * capacity
+        self._condition = threading.Condition()
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+    def publish(self, changes: Iterable[Tuple[str, Dict[str, Any]]]):
+        """
+        Append events for one committed write and wake waiting subscribers.
+
+        Registered as a SnapshotStore listener, so it runs under the store's write
+        lock and event IDs follow commit order.
+
+        Args:
+            changes: (kind, transaction) pairs, kind being insert, replace or remove
+        """
+        payloads = [(EVENT_NAMES[kind], self._encode({'transaction': transaction}).encode('utf-8'))
+                    for kind, transaction in changes]
+        if not payloads:
+            return
+        with self._condition:
+            for event, payload in payloads:
+                self.last_id += 1
+                self._frames[self.last_id % self.capacity] = (
+                    b'id: %d\nevent: %s\ndata: %s\n\n' % (self.last_id, event.encode('ascii'), payload))
+            self._condition.notify_all()
+
+    def read(self, after_id: int, timeout: float) -> Tuple[Optional[List[bytes]], int]:
+        """
+        Return the frames published after an event ID, waiting up to timeout for one.
+
+        Returns:
+            Tuple[Optional[List[bytes]], int]: The frames (empty on timeout) and
+            the ID to resume from. Frames are None when after_id is no longer
+            in the buffer or comes from before a restart; the caller should
+            resynchronize and resume from the returned (newest) ID.
+        """
+        with self._condition:
+            if after_id == self.last_id:
+                self._condition.wait(timeout)
+            last_id = self.last_id
+            if after_id > last_id or after_id < last_id - self.capacity:
+                return None, last_id
+            return [self._frames[event_id % self.capacity]
+                    for event_id in range(after_id + 1, last_id + 1)], last_id
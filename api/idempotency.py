@@ -0,0 +1,88 @@
+"""
+Idempotency Cache Module
+Remembers responses to recent POST requests by Idempotency-Key so that
+client retries replay the original response instead of creating duplicates.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class IdempotencyCache:
+    """Time- and size-bounded map of idempotency keys to stored responses."""
+
+    # Outcomes of begin()
+    NEW = 'new'
+    REPLAY = 'replay'
+    IN_PROGRESS = 'in_progress'
+    MISMATCH = 'mismatch'
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 24 * 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> {'expires': float, 'fingerprint': str, 'response': Optional[(status, data)]}
+        self._entries: 'OrderedDict[Tuple[str, str], Dict[str, Any]]' = OrderedDict()
+
+    def begin(self, key: Tuple[str, str], fingerprint: str
+              ) -> Tuple[str, Optional[Tuple[int, Any]]]:
+        """
+        Claim a key before processing a request.
+
+        Args:
+            key (Tuple[str, str]): (username, Idempotency-Key header)
+            fingerprint (str): Digest of the request body
+
+        Returns:
+            Tuple[str, Optional[Tuple[int, Any]]]: Outcome and, for REPLAY, the
+            stored (status_code, response_data)
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry['fingerprint'] != fingerprint:
+                    return self.MISMATCH, None
+                if entry['response'] is None:
+                    return self.IN_PROGRESS, None
+                return self.REPLAY, entry['response']
+
+            self._entries[key] = {'expires': now + self.ttl_seconds,
+                                  'fingerprint': fingerprint, 'response': None}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return self.NEW, None
+
+    def complete(self, key: Tuple[str, str], status_code: int, data: Any):
+        """Store the response for a claimed key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['response'] = (status_code, data)
+
+    def release(self, key: Tuple[str, str]):
+        """Forget a claimed key (the request failed and may be retried)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['response'] is None:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _evict_expired(self, now: float):
+        """
+        Drop expired entries from the oldest end (caller holds the lock).
+
+        Entries are kept in insertion order with a constant TTL, so expired
+        entries are always at the front.
+        """
+        while self._entries:
+            oldest_key = next(iter(self._entries))
+            if self._entries[oldest_key]['expires'] > now:
+                break
+            del self._entries[oldest_key]
@@ -0,0 +1,123 @@
+"""
+Metrics Module
+In-process request counters and fixed-bucket latency histograms rendered in
+the Prometheus text exposition format.
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Tuple
+
+
+# Upper bounds (seconds) shared by every latency histogram
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus cumulative semantics."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Record a single observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Return (le, cumulative_count) pairs including +Inf."""
+        result = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            running += bucket_count
+            result.append((repr(bound), running))
+        result.append(('+Inf', running + self.counts[-1]))
+        return result
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Format a label tuple as {k="v",...}."""
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels:
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{escaped}"')
+    return '{' + ','.join(parts) + '}'
+
+
+class MetricsRegistry:
+    """Thread-safe registry of labelled counters and histograms."""
+
+    def __init__(self, prefix: str = 'sms_api'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+        self._histograms: Dict[str, Dict[Tuple, Histogram]] = {}
+
+    def describe(self, name: str, metric_type: str, help_text: str):
+        """Register HELP/TYPE metadata for a metric family."""
+        self._help[name] = (metric_type, help_text)
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        """Increment a labelled counter."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            family = self._counters.setdefault(name, {})
+            family[key] = family.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record an observation in a labelled histogram."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            family = self._histograms.setdefault(name, {})
+            histogram = family.get(key)
+            if histogram is None:
+                histogram = family[key] = Histogram()
+            histogram.observe(value)
+
+    def render(self) -> str:
+        """Render every metric family in Prometheus text format."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                full_name = f'{self.prefix}_{name}'
+                self._render_header(lines, name, full_name, 'counter')
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append(f'{full_name}{_format_labels(labels)} {value:g}')
+
+            for name in sorted(self._histograms):
+                full_name = f'{self.prefix}_{name}'
+                self._render_header(lines, name, full_name, 'histogram')
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    for le, cumulative in histogram.cumulative():
+                        bucket_labels = labels + (('le', le),)
+                        lines.append(f'{full_name}_bucket{_format_labels(bucket_labels)} {cumulative}')
+                    lines.append(f'{full_name}_sum{_format_labels(labels)} {histogram.sum:.9f}')
+                    lines.append(f'{full_name}_count{_format_labels(labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def _render_header(self, lines: List[str], name: str, full_name: str, default_type: str):
+        """Append HELP/TYPE lines for a metric family."""
+        metric_type, help_text = self._help.get(name, (default_type, ''))
+        if help_text:
+            lines.append(f'# HELP {full_name} {help_text}')
+        lines.append(f'# TYPE {full_name} {metric_type}')
+
+
+# Shared registry used by the API server
+METRICS = MetricsRegistry()
+METRICS.describe('requests_total', 'counter', 'Total HTTP requests by method, route and status code.')
+METRICS.describe('response_bytes_total', 'counter', 'Total response body bytes sent by method and route.')
+METRICS.describe('request_duration_seconds', 'histogram', 'End-to-end request handling latency.')
+METRICS.describe('stage_duration_seconds', 'histogram',
+                 'Latency of request stages (auth, store, serialize) by route.')
+METRICS.describe('velocity_alerts_total', 'counter', 'Velocity rule breaches on new transactions by rule and action.')
+METRICS.describe('response_cache_requests_total', 'counter',
+                 'Requests to response-cached routes by route and result (hit, miss, coalesced, bypass).')
@@ -0,0 +1,163 @@
+"""
+Request Profiler Module
+Samples a fraction of API requests and aggregates profiles per route, either
+with cProfile (deterministic, exportable as pstats) or with a background stack
+sampler thread (low overhead, exportable as collapsed stacks for flamegraphs).
+"""
+
+import cProfile
+import io
+import marshal
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+
+class RequestProfiler:
+    """Profiles a sampled fraction of requests and aggregates results per route."""
+
+    MODES = ('cprofile', 'sampler')
+
+    def __init__(self, sample_rate: float = 0.01, mode: str = 'cprofile',
+                 sampler_interval: float = 0.005):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.sampler_interval = sampler_interval
+        self._lock = threading.Lock()
+        self._stats: Dict[str, pstats.Stats] = {}
+        self._stacks: Dict[str, Counter] = {}
+        self._sampled_requests: Counter = Counter()
+        self._active_threads: Dict[int, str] = {}
+        # cProfile is interpreter-wide on Python 3.12+ (only one Profile can be
+        # enabled at a time), so at most one request is profiled at once
+        self._cprofile_slot = threading.Lock()
+
+        if mode == 'sampler':
+            sampler = threading.Thread(target=self._sample_loop, name='stack-sampler', daemon=True)
+            sampler.start()
+
+    def should_sample(self) -> bool:
+        """Decide whether the current request is profiled."""
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def run(self, route: str, func: Callable[..., Any], *args) -> Any:
+        """
+        Run func(*args) under the configured profiler and record it for route.
+
+        In cprofile mode a request sampled while another is being profiled
+        (or while some other profiler is active) runs unprofiled and is not
+        counted.
+        """
+        if self.mode == 'sampler':
+            with self._lock:
+                self._sampled_requests[route] += 1
+            ident = threading.get_ident()
+            self._active_threads[ident] = route
+            try:
+                return func(*args)
+            finally:
+                self._active_threads.pop(ident, None)
+
+        if not self._cprofile_slot.acquire(blocking=False):
+            return func(*args)
+        try:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:  # "Another profiling tool is already active"
+                return func(*args)
+            try:
+                return func(*args)
+            finally:
+                profile.disable()
+                with self._lock:
+                    self._sampled_requests[route] += 1
+                    existing = self._stats.get(route)
+                    if existing is None:
+                        self._stats[route] = pstats.Stats(profile)
+                    else:
+                        existing.add(profile)
+        finally:
+            self._cprofile_slot.release()
+
+    def _sample_loop(self):
+        """Periodically capture stacks of threads currently serving sampled requests."""
+        while True:
+            time.sleep(self.sampler_interval)
+            if not self._active_threads:
+                continue
+            frames = sys._current_frames()
+            for ident, route in list(self._active_threads.items()):
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                collapsed = ';'.join(reversed(stack))
+                with self._lock:
+                    self._stacks.setdefault(route, Counter())[collapsed] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Return sampling configuration and per-route sample counts."""
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'sample_rate': self.sample_rate,
+                'sampled_requests': dict(self._sampled_requests),
+                'routes': sorted(set(self._stats) | set(self._stacks))
+            }
+
+    def pstats_dump(self, route: Optional[str] = None) -> bytes:
+        """Return marshalled pstats data (loadable with pstats.Stats/snakeviz)."""
+        with self._lock:
+            combined = self._combined_stats(route)
+            return marshal.dumps(combined.stats) if combined else marshal.dumps({})
+
+    def pstats_text(self, route: Optional[str] = None, limit: int = 50) -> str:
+        """Return a human-readable cumulative-time report."""
+        with self._lock:
+            combined = self._combined_stats(route)
+            if combined is None:
+                return "No profiles collected yet\n"
+            buffer = io.StringIO()
+            combined.stream = buffer
+            combined.sort_stats('cumulative').print_stats(limit)
+            return buffer.getvalue()
+
+    def collapsed_stacks(self, route: Optional[str] = None) -> str:
+        """Return stack samples in collapsed format (flamegraph.pl / speedscope)."""
+        with self._lock:
+            totals = Counter()
+            for stack_route, stacks in self._stacks.items():
+                if route is None or stack_route == route:
+                    totals.update(stacks)
+            return ''.join(f"{stack} {count}\n" for stack, count in totals.most_common())
+
+    def reset(self):
+        """Discard all collected profiles."""
+        with self._lock:
+            self._stats.clear()
+            self._stacks.clear()
+            self._sampled_requests.clear()
+
+    def _combined_stats(self, route: Optional[str]) -> Optional[pstats.Stats]:
+        """Merge per-route stats (caller must hold the lock)."""
+        selected = [stats for stats_route, stats in self._stats.items()
+                    if route is None or stats_route == route]
+        if not selected:
+            return None
+        combined = pstats.Stats()
+        combined.add(*selected)
+        return combined
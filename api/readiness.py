@@ -0,0 +1,76 @@
+"""
+Readiness Module
+Start-up state reported by GET /health. The server binds its socket before it
+loads the data file and does the loading on a background thread, so health
+checks are answered within milliseconds of process start: 503 with load
+progress while the file is parsed, 200 once the store is live. A failed
+load keeps it at 503, reporting the error.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+
+class StartupState:
+    """Phase and progress of background start-up, written by one loader thread."""
+
+    def __init__(self, ready: bool = True):
+        """
+        Args:
+            ready (bool): Start in the ready state (no background loading)
+        """
+        self.started_at = time.time()
+        self.ready_at: Optional[float] = self.started_at if ready else None
+        self.phase = 'ready' if ready else 'starting'
+        self.bytes_read = 0
+        self.bytes_total: Optional[int] = None
+        self.records = 0
+        self.skipped = 0  # invalid records left out of the load
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None
+
+    def begin(self, phase: str, bytes_total: Optional[int] = None):
+        """Enter a new phase (e.g. loading, indexing, archiving)."""
+        self.bytes_read = 0
+        self.bytes_total = bytes_total
+        self.phase = phase
+
+    def advance(self, bytes_read: int, records: int):
+        """Progress callback for TransactionParser and TransactionFileIndex."""
+        self.bytes_read = bytes_read
+        self.records = records
+
+    def fail(self, error: str):
+        """Record a start-up error; the server then never reports ready."""
+        self.error = error
+        self.phase = 'failed'
+
+    def finish(self, records: int):
+        """Mark start-up complete; the server then serves every route."""
+        self.records = records
+        if self.bytes_total is not None:
+            self.bytes_read = self.bytes_total
+        self.phase = 'ready'
+        self.ready_at = time.time()
+
+    def status(self) -> Dict[str, Any]:
+        """JSON-serializable state for GET /health."""
+        now = time.time()
+        ready_at = self.ready_at
+        status = {
+            'status': 'ready' if ready_at is not None else 'failed' if self.error is not None else 'loading',
+            'phase': self.phase,
+            'uptime_seconds': round(now - self.started_at, 3),
+            'startup_seconds': round(ready_at - self.started_at, 3) if ready_at is not None else None,
+            'records': self.records,
+            'skipped_records': self.skipped,
+            'bytes_read': self.bytes_read,
+            'bytes_total': self.bytes_total,
+            'progress': round(min(self.bytes_read / self.bytes_total, 1.0), 4) if self.bytes_total else None
+        }
+        if self.error is not None:
+            status['error'] = self.error
+        return status
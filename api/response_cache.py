@@ -0,0 +1,170 @@
+"""
+Response Cache Module
+Optional in-process cache of whole GET responses, in the manner of a caching
+reverse proxy in front of the API. Responses are keyed by user, normalized
+path and sorted query parameters, live for a fixed TTL and are evicted least
+recently used first to stay within a byte budget. Each response is tagged
+with the store version it was computed from and is only served while that
+version is current, so a write invalidates every stored response. Concurrent
+misses for the same key are coalesced: one request computes the response and
+the others wait for it and replay it.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Route templates cached when no routes are configured
+DEFAULT_ROUTES = ('/transactions', '/transactions/search', '/transactions/analytics')
+
+# Per-connection headers regenerated for every response rather than replayed
+HOP_HEADERS = frozenset({'server', 'date', 'connection', 'keep-alive', 'x-cache', 'age'})
+
+# Bookkeeping bytes counted per entry on top of its body and headers
+ENTRY_OVERHEAD = 200
+
+
+class CachedResponse:
+    """Status, headers and body of one stored response."""
+
+    __slots__ = ('status', 'headers', 'body', 'version', 'stored_at', 'expires', 'size')
+
+    def __init__(self, status: int, headers: Tuple[Tuple[str, str], ...], body: bytes,
+                 version: int, stored_at: float, expires: float):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.version = version
+        self.stored_at = stored_at
+        self.expires = expires
+        self.size = len(body) + sum(len(name) + len(value) for name, value in headers) + ENTRY_OVERHEAD
+
+
+class _Flight:
+    """A miss being computed; followers wait on done."""
+
+    __slots__ = ('version', 'done', 'response')
+
+    def __init__(self, version: int):
+        self.version = version
+        self.done = threading.Event()
+        self.response: Optional[CachedResponse] = None
+
+
+class ResponseCache:
+    """TTL and byte-budget bounded map of request keys to responses."""
+
+    # Outcomes of begin()
+    HIT = 'hit'              # fresh stored response returned
+    MISS = 'miss'            # caller computes the response and must call complete()
+    COALESCED = 'coalesced'  # waited for a concurrent miss and got its response
+    BYPASS = 'bypass'        # no usable concurrent miss; compute without caching
+
+    def __init__(self, routes: Iterable[str] = DEFAULT_ROUTES, ttl_seconds: float = 2.0,
+                 max_bytes: int = 64 * 1024 * 1024, wait_timeout: float = 30.0):
+        """
+        Args:
+            routes (Iterable[str]): Route templates whose GET responses are cached
+            ttl_seconds (float): Longest a response is served from the cache
+                while no write happens
+            max_bytes (int): Budget for stored responses; a response larger than
+                a quarter of it is never stored
+            wait_timeout (float): Longest a coalesced request waits for its leader
+        """
+        if ttl_seconds <= 0 or max_bytes <= 0:
+            raise ValueError("Response cache TTL and size must be positive")
+        self.routes = frozenset(routes)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 4
+        self.wait_timeout = wait_timeout
+        self.size = 0
+        self._entries: 'OrderedDict[Tuple, CachedResponse]' = OrderedDict()  # LRU order
+        self._flights: Dict[Tuple, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @staticmethod
+    def key(user: Optional[str], parts: Tuple[str, ...],
+            query: Dict[str, Any]) -> Tuple:
+        """
+        Cache key of a request: user, path segments (so /transactions/ and
+        /transactions match) and query parameters in sorted order.
+        """
+        return user, parts, tuple(sorted((name, tuple(values)) for name, values in query.items()))
+
+    def begin(self, key: Tuple, version: int) -> Tuple[str, Optional[CachedResponse]]:
+        """
+        Look up a key, waiting if the same response is being computed.
+
+        Args:
+            key (Tuple): Request key from key()
+            version (int): Current store version; responses computed from
+                another version are not served
+
+        Returns:
+            Tuple[str, Optional[CachedResponse]]: Outcome and, for HIT and
+            COALESCED, the response to replay
+        """
+        now = time.monotonic()
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                if response.expires > now and response.version == version:
+                    self._entries.move_to_end(key)
+                    return self.HIT, response
+                if response.version <= version:
+                    self._discard(key)
+            flight = self._flights.get(key)
+            if flight is None:
+                self._flights[key] = _Flight(version)
+                return self.MISS, None
+            if flight.version != version:
+                return self.BYPASS, None
+
+        if flight.done.wait(self.wait_timeout) and flight.response is not None:
+            return self.COALESCED, flight.response
+        return self.BYPASS, None
+
+    def complete(self, key: Tuple, status: int, headers: Iterable[Tuple[str, str]],
+                 body: bytes) -> Optional[CachedResponse]:
+        """
+        Store the response of a MISS and release waiting requests.
+
+        Only complete 200 responses are stored; anything else (an error, a
+        handler that raised, a body too large for the budget) releases the
+        waiters to compute their own.
+        """
+        headers = tuple((name, value) for name, value in headers
+                        if name.lower() not in HOP_HEADERS)
+        response = None
+        lengths = [value for name, value in headers if name.lower() == 'content-length']
+        flight = self._flights.get(key)
+        if flight is not None and status == 200 and lengths == [str(len(body))]:
+            now = time.monotonic()
+            response = CachedResponse(status, headers, body, flight.version, now, now + self.ttl_seconds)
+            if response.size > self.max_entry_bytes:
+                response = None
+        with self._lock:
+            current = self._entries.get(key)
+            if response is not None and (current is None or current.version <= response.version):
+                self._discard(key)
+                self._entries[key] = response
+                self.size += response.size
+                while self.size > self.max_bytes:
+                    self._discard(next(iter(self._entries)))
+            self._flights.pop(key, None)
+        if flight is not None:
+            flight.response = response
+            flight.done.set()
+        return response
+
+    def _discard(self, key: Tuple):
+        """Remove an entry if present (caller holds the lock)."""
+        response = self._entries.pop(key, None)
+        if response is not None:
+            self.size -= response.size
@@ -0,0 +1,180 @@
+"""
+Request Router Module
+Precompiled route table mapping (method, path template) to handler names and a
+lightweight Request object parsed once per request. Static paths resolve with
+one dict lookup and parameterized paths only try the few routes with the same
+method, segment count and leading literal segment, so dispatch cost does not grow with the number of
+endpoints.
+"""
+
+import urllib.parse
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Converter name -> callable used for typed path parameters, e.g. {id:int}
+CONVERTERS: Dict[str, Callable[[str], Any]] = {'int': int, 'str': str}
+
+
+class Route:
+    """One compiled route."""
+
+    __slots__ = ('method', 'template', 'label', 'handler', 'auth', 'admin', 'startup', 'segments')
+
+    def __init__(self, method: str, template: str, handler: str,
+                 auth: bool = True, admin: bool = False, startup: bool = False):
+        self.method = method
+        self.template = template
+        self.handler = handler
+        self.auth = auth
+        self.admin = admin
+        self.startup = startup  # served while start-up data loading is still in progress
+        # Each segment is (literal, None, None) or (None, name, converter)
+        segments = []
+        for part in split_path(template):
+            if part.startswith('{') and part.endswith('}'):
+                name, _, converter = part[1:-1].partition(':')
+                segments.append((None, name, CONVERTERS[converter or 'str']))
+            else:
+                segments.append((part, None, None))
+        self.segments = tuple(segments)
+        # Template without converters, e.g. /transactions/{id}
+        self.label = '/' + '/'.join(literal or f'{{{name}}}' for literal, name, _ in segments)
+
+    @property
+    def is_static(self) -> bool:
+        return all(literal is not None for literal, _, _ in self.segments)
+
+    def match(self, parts: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        """
+        Match path segments against this route.
+
+        Returns:
+            Optional[Dict]: Converted parameters, or None if a literal differs
+
+        Raises:
+            ValueError: If the literals match but a typed parameter does not convert
+        """
+        params = {}
+        for part, (literal, name, converter) in zip(parts, self.segments):
+            if literal is not None:
+                if part != literal:
+                    return None
+            else:
+                try:
+                    params[name] = converter(part)
+                except ValueError:
+                    raise ValueError(f"Invalid {name}: {part}")
+        return params
+
+
+class Request:
+    """Method, path, route and lazily parsed query string of one HTTP request."""
+
+    __slots__ = ('method', 'path', 'query_string', 'parts', 'route', 'params',
+                 'label', 'allowed', 'error', '_query')
+
+    def __init__(self, method: str, target: str):
+        self.method = method
+        self.path, _, self.query_string = target.partition('?')
+        self.parts = split_path(self.path)
+        self.route: Optional[Route] = None
+        self.params: Dict[str, Any] = {}
+        self.label = 'other'             # route template used as the metrics label
+        self.allowed: List[str] = []    # methods of routes matching the path (for 405)
+        self.error: Optional[str] = None  # typed parameter conversion error (for 400)
+        self._query: Optional[Dict[str, List[str]]] = None
+
+    @property
+    def query(self) -> Dict[str, List[str]]:
+        """Query parameters, parsed on first access."""
+        if self._query is None:
+            self._query = urllib.parse.parse_qs(self.query_string)
+        return self._query
+
+
+def split_path(path: str) -> Tuple[str, ...]:
+    """Split a URL path into non-empty segments."""
+    return tuple(part for part in path.split('/') if part)
+
+
+class Router:
+    """Route table compiled into per-method lookup structures."""
+
+    def __init__(self, routes: Sequence[tuple] = ()):
+        """
+        Args:
+            routes: (method, template, handler[, options]) tuples, where options
+                is a dict of Route keyword arguments such as auth or admin
+        """
+        self.routes: List[Route] = []
+        self.methods: List[str] = []
+        self._static: Dict[Tuple[str, Tuple[str, ...]], Route] = {}
+        # (method, segment count, leading literal or None) -> routes
+        self._dynamic: Dict[Tuple[str, int, Optional[str]], List[Route]] = {}
+        for method, template, handler, *options in routes:
+            self.add(method, template, handler, **(options[0] if options else {}))
+
+    def add(self, method: str, template: str, handler: str, **options) -> Route:
+        """Compile and register a route."""
+        route = Route(method, template, handler, **options)
+        self.routes.append(route)
+        if method not in self.methods:
+            self.methods.append(method)
+        if route.is_static:
+            self._static[(method, tuple(literal for literal, _, _ in route.segments))] = route
+        else:
+            key = (method, len(route.segments), route.segments[0][0])
+            self._dynamic.setdefault(key, []).append(route)
+        return route
+
+    def resolve(self, method: str, target: str) -> Request:
+        """
+        Build the Request for a method and request target.
+
+        On success request.route and request.params are set. Otherwise
+        request.allowed lists the methods the path does support (405), or
+        request.error describes a parameter that failed to convert (400).
+        """
+        request = Request(method, target)
+        route, params, error = self._find(method, request.parts)
+        if route is not None and error is None:
+            request.route = route
+            request.params = params
+            request.label = route.label
+            return request
+
+        for other in self.methods:
+            if other != method:
+                other_route, _, other_error = self._find(other, request.parts)
+                if other_route is not None and other_error is None:
+                    request.allowed.append(other)
+                    request.label = other_route.label
+        if route is not None and not request.allowed:
+            request.error = error
+            request.label = route.label
+        return request
+
+    def _find(self, method: str, parts: Tuple[str, ...]):
+        """
+        Return (route, params, error) for one method.
+
+        When only a typed parameter fails to convert, the route whose literals
+        matched is returned together with the conversion error.
+        """
+        route = self._static.get((method, parts))
+        if route is not None:
+            return route, {}, None
+        failed = None
+        candidates = self._dynamic.get((method, len(parts), parts[0] if parts else None), [])
+        if parts:
+            candidates = candidates + self._dynamic.get((method, len(parts), None), [])
+        for route in candidates:
+            try:
+                params = route.match(parts)
+            except ValueError as e:
+                failed = failed or (route, str(e))
+                continue
+            if params is not None:
+                return route, params, None
+        if failed is not None:
+            return failed[0], None, failed[1]
+        return None, None, None
@@ -0,0 +1,179 @@
+"""
+Search Index Module
+Tokenized inverted index over the text fields of transactions. Each token maps
+to the set of transaction IDs containing it; a sorted vocabulary turns every
+query term into a prefix match, so fragments such as "TXN00" or "agent_0"
+find the full references and agent IDs. Postings of all terms are
+intersected smallest first, outside the lock that commits take. The index is
+kept up to date incrementally as a SnapshotStore commit listener.
+"""
+
+import bisect
+import re
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Fields whose text is indexed
+SEARCH_FIELDS = ('reference', 'sender', 'receiver', 'type', 'status')
+
+_TOKEN = re.compile(r'[0-9a-z]+')
+
+# Changes buffered during a build are replayed in rounds without the lock
+# until at most this many remain, which are replayed while holding it
+REPLAY_UNDER_LOCK = 1000
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-case alphanumeric tokens."""
+    return _TOKEN.findall(text.lower())
+
+
+def record_tokens(transaction: Dict[str, Any]) -> FrozenSet[str]:
+    """Distinct tokens of a transaction's searchable fields."""
+    tokens = set()
+    for field in SEARCH_FIELDS:
+        value = transaction.get(field)
+        if value:
+            tokens.update(_TOKEN.findall(str(value).lower()))
+    return frozenset(tokens)
+
+
+class SearchIndex:
+    """Inverted index of token -> transaction IDs with prefix queries."""
+
+    def __init__(self):
+        self.postings: Dict[str, Set[int]] = {}
+        self.vocabulary: List[str] = []            # sorted tokens, for prefix ranges
+        self._tokens: Dict[int, FrozenSet[str]] = {}  # id -> indexed tokens, for removal
+        self._pending: Optional[List[Tuple[str, Dict[str, Any]]]] = None  # commits during a build
+        self._lock = threading.Lock()
+        # Tokens whose posting set a search may be reading without the lock;
+        # the set is copied before it next changes
+        self._shared: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    @classmethod
+    def for_store(cls, store) -> 'SearchIndex':
+        """
+        Build an index over a SnapshotStore and keep it updated on every commit.
+
+        The build runs without the lock; commits that land meanwhile are only
+        buffered by the listener, so writers never wait for it, and are
+        replayed on top of the built index before it is returned.
+        """
+        index = cls()
+        index._pending = []
+        snapshot = store.add_listener(index.apply)
+        # Nothing reads the index until it is returned and apply() only
+        # touches the buffer, so the build needs no lock
+        for transaction in snapshot:
+            index._add(transaction)
+        index.vocabulary = sorted(index.postings)
+        while True:
+            with index._lock:
+                pending = index._pending
+                if len(pending) <= REPLAY_UNDER_LOCK:
+                    index._apply(pending)
+                    index._pending = None
+                    return index
+                index._pending = []
+            index._apply(pending)
+
+    def apply(self, changes: Iterable[Tuple[str, Dict[str, Any]]]):
+        """Apply one commit's (kind, transaction) changes (commit listener)."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.extend(changes)
+                return
+            self._apply(changes)
+
+    def _apply(self, changes: Iterable[Tuple[str, Dict[str, Any]]]):
+        new_tokens = []
+        for kind, transaction in changes:
+            self._remove(transaction['id'])
+            if kind != 'remove':
+                new_tokens.extend(token for token in self._add(transaction)
+                                  if len(self.postings[token]) == 1)
+        # Few new tokens (a single write) are inserted in place; a large
+        # batch (an import) is appended and merged by one sort of two runs
+        new_tokens = [token for token in set(new_tokens) if token in self.postings]
+        if len(new_tokens) <= 16:
+            for token in new_tokens:
+                bisect.insort(self.vocabulary, token)
+        else:
+            self.vocabulary.extend(sorted(new_tokens))
+            self.vocabulary.sort()
+
+    def search(self, query: str) -> List[int]:
+        """
+        IDs of transactions matching every term of the query, in ascending order.
+
+        Each term matches any token it is a prefix of, in any indexed field.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        matches = []
+        with self._lock:
+            for term in terms:
+                postings = self._expand(term)
+                if not postings:
+                    return []
+                matches.append(postings)
+        matches.sort(key=len)
+        result = set(matches[0])
+        for postings in matches[1:]:
+            result.intersection_update(postings)
+            if not result:
+                break
+        return sorted(result)
+
+    def _expand(self, term: str) -> Set[int]:
+        """
+        Postings of every token starting with term (caller holds the lock).
+
+        The result does not change once the lock is released: a single
+        token's set is marked shared rather than copied, and several are
+        merged into a new set.
+        """
+        start = bisect.bisect_left(self.vocabulary, term)
+        end = bisect.bisect_left(self.vocabulary, term + '\uffff', start)
+        if end - start == 1:
+            token = self.vocabulary[start]
+            self._shared.add(token)
+            return self.postings[token]
+        return set().union(*(self.postings[token] for token in self.vocabulary[start:end]))
+
+    def _writable(self, token: str) -> Set[int]:
+        """Posting set of a token to modify, copied first if a search may be reading it."""
+        postings = self.postings.get(token)
+        if postings is None:
+            postings = self.postings[token] = set()
+        elif token in self._shared:
+            self._shared.discard(token)
+            postings = self.postings[token] = postings.copy()
+        return postings
+
+    def _add(self, transaction: Dict[str, Any]) -> FrozenSet[str]:
+        tokens = record_tokens(transaction)
+        self._tokens[transaction['id']] = tokens
+        for token in tokens:
+            postings = self.postings.get(token)
+            if postings is None or token in self._shared:
+                postings = self._writable(token)
+            postings.add(transaction['id'])
+        return tokens
+
+    def _remove(self, transaction_id: int):
+        for token in self._tokens.pop(transaction_id, ()):
+            if len(self.postings[token]) > 1:
+                self._writable(token).discard(transaction_id)
+            else:
+                del self.postings[token]
+                self._shared.discard(token)
+                # Tokens first seen in the current batch are not in the vocabulary yet
+                position = bisect.bisect_left(self.vocabulary, token)
+                if position < len(self.vocabulary) and self.vocabulary[position] == token:
+                    del self.vocabulary[position]
@@ -3,27 +3,241 @@ REST API Server for SMS Transactions
 Implements CRUD operations with Basic Authentication using Python's http.server
 """
 
+import argparse
 import http.server
-import socketserver
 import json
 import base64
-import urllib.parse
+import functools
+import hashlib
+import operator
+import re
+import time
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
 from typing import Dict, List, Optional, Any
 import sys
 import os
+import threading
 
-# Add the dsa directory to Python path to import xml_parser
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'dsa'))
-from xml_parser import TransactionParser
+# Add the dsa directory to Python path to import xml_parser. Index 1 puts it
+# right after this script's directory and ahead of the standard library and
+# site-packages, so its modules resolve without scanning every installed
+# package. A module in dsa/ therefore shadows any stdlib or installed module of
+# the same name: keep names such as schema and analytics distinct from both.
+# analytics (and NumPy, the largest import by far) is imported on first use,
+# after the server is up.
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), '..', 'dsa'))
+from schema import TRANSACTION_SCHEMA, ValidationError
+from xml_parser import (TransactionParser, TransactionFileIndex, InvalidRecordError, EXPORT_FIELDS,
+                        iter_csv, iter_ndjson)
+from metrics import METRICS
+from profiler import RequestProfiler
+from access_log import AccessLogWriter
+from idempotency import IdempotencyCache
+from changefeed import ChangeFeed
+from search import SearchIndex
+from velocity import DEFAULT_RULES, VelocityMonitor, parse_rule
+from store import SnapshotStore
+from router import Request, Router
+from archive import GRANULARITIES, PartitionArchive, parse_timestamp
+from readiness import StartupState
+from response_cache import DEFAULT_ROUTES as CACHE_ROUTES, CachedResponse, ResponseCache
+
+
+# Fields of a transaction record, in serialization order
+TRANSACTION_FIELDS = ('id', 'type', 'amount', 'sender', 'receiver', 'timestamp', 'reference', 'status')
+
+
+@functools.lru_cache(maxsize=128)
+def projection_serializer(fields: tuple):
+    """
+    Build (and cache) a function projecting a transaction onto the given fields.
+    
+    Args:
+        fields (tuple): Field names, already validated against TRANSACTION_FIELDS
+        
+    Returns:
+        Callable: record -> dict containing only the requested fields
+    """
+    if len(fields) == 1:
+        field = fields[0]
+        return lambda record: {field: record[field]}
+    getter = operator.itemgetter(*fields)
+    return lambda record: dict(zip(fields, getter(record)))
+
+
+def parse_fields(query_params: Dict[str, List[str]]) -> Optional[tuple]:
+    """
+    Parse the sparse fieldset from ?fields=id,amount,status.
+    
+    Returns:
+        Optional[tuple]: Requested fields in TRANSACTION_FIELDS order, or None for all fields
+        
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if 'fields' not in query_params:
+        return None
+    requested = {f.strip() for value in query_params['fields'] for f in value.split(',') if f.strip()}
+    unknown = requested - set(TRANSACTION_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    if not requested or requested == set(TRANSACTION_FIELDS):
+        return None
+    return tuple(f for f in TRANSACTION_FIELDS if f in requested)
+
+
+def parse_time_range(query_params: Dict[str, List[str]]) -> tuple:
+    """
+    Parse ?since=...&until=... ISO 8601 bounds into epoch seconds.
+    
+    Returns:
+        tuple: (since, until), each None when not given
+        
+    Raises:
+        ValueError: If a bound is not a valid timestamp
+    """
+    bounds = []
+    for name in ('since', 'until'):
+        value = query_params.get(name, [None])[0]
+        epoch = parse_timestamp(value)
+        if value is not None and epoch is None:
+            raise ValueError(f"Invalid {name} timestamp: {value}")
+        bounds.append(epoch)
+    return tuple(bounds)
+
+
+# Hex size at the start of each chunk of a chunked request body
+_CHUNK_SIZE = re.compile(rb'[0-9A-Fa-f]{1,16}')
+
+# Opaque tag of each entity-tag in an If-None-Match list, weak or strong
+_ENTITY_TAG = re.compile(r'(?:W/)?("[^"]*")')
+
+
+class VersionConflict(Exception):
+    """Raised when an If-Match version does not match the stored record version."""
+    
+    def __init__(self, current_version: Optional[int]):
+        super().__init__(f"Version conflict (current version {current_version})")
+        self.current_version = current_version
+
+
+class MalformedBody(ValueError):
+    """Raised when a chunked request body is not framed correctly."""
+
+
+class DuplicateReference(Exception):
+    """Raised when an update would give a transaction another record's reference."""
+    
+    def __init__(self, reference: str, existing_id: int):
+        super().__init__(f"Reference {reference} already belongs to transaction {existing_id}")
+        self.reference = reference
+        self.existing_id = existing_id
+
+
+def instrumented(handler_method):
+    """
+    Resolve the request through the route table, then record count, status,
+    bytes and latency metrics for a do_* method called with the Request.
+    """
+    @functools.wraps(handler_method)
+    def wrapper(self):
+        self._status_code = None
+        self._bytes_sent = 0
+        self._stage_timings = []
+        request = self.ROUTER.resolve(self.command, self.path)
+        route = request.label
+        start_time = time.perf_counter()
+        try:
+            profiler = self.profiler
+            if profiler is not None and profiler.should_sample():
+                return profiler.run(route, handler_method, self, request)
+            return handler_method(self, request)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            status = str(self._status_code or 500)
+            METRICS.inc('requests_total', method=self.command, route=route, status=status)
+            METRICS.inc('response_bytes_total', self._bytes_sent, method=self.command, route=route)
+            METRICS.observe('request_duration_seconds', elapsed, method=self.command, route=route)
+            for stage, stage_elapsed in self._stage_timings:
+                METRICS.observe('stage_duration_seconds', stage_elapsed, stage=stage, route=route)
+            if self.access_log is not None:
+                self.access_log.log({
+                    'client': self.client_address[0],
+                    'user': getattr(self, 'username', None),
+                    'method': self.command,
+                    'path': self.path,
+                    'route': route,
+                    'status': self._status_code or 500,
+                    'bytes': self._bytes_sent,
+                    'duration_ms': round(elapsed * 1000, 3)
+                })
+    return wrapper
 
 
 class TransactionAPIHandler(http.server.BaseHTTPRequestHandler):
     """HTTP request handler for transaction API endpoints."""
     
-    # In-memory storage (in production, use a proper database)
-    transactions_list = []
-    transactions_dict = {}
-    next_id = 1
+    # Persistent connections: idle connections are closed after `timeout`
+    # seconds and every connection after MAX_KEEPALIVE_REQUESTS requests
+    protocol_version = 'HTTP/1.1'
+    timeout = 15
+    MAX_KEEPALIVE_REQUESTS = 1000
+    
+    # Headers and body go out in separate writes; without TCP_NODELAY the body
+    # of a small response waits on the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+    
+    # Unread request bodies up to this size are drained to keep the connection
+    # usable; larger (or chunked) ones close it instead
+    MAX_DRAIN_BYTES = 64 * 1024
+    
+    # Default XML source loaded at startup (overridable with --data)
+    DATA_FILE = 'data/modified_sms_v2.xml'
+    
+    # Precompiled route table: (method, path template, handler[, options])
+    ROUTER = Router([
+        ('GET', '/transactions', 'handle_list'),
+        ('GET', '/transactions/export', 'handle_export'),
+        ('GET', '/transactions/analytics', 'handle_analytics'),
+        ('GET', '/transactions/stream', 'handle_stream'),
+        ('GET', '/transactions/search', 'handle_search'),
+        ('GET', '/transactions/{id:int}', 'handle_get'),
+        ('POST', '/transactions', 'handle_create'),
+        ('POST', '/transactions/import', 'handle_import'),
+        ('PUT', '/transactions/{id:int}', 'handle_update'),
+        ('PATCH', '/transactions/{id:int}', 'handle_update'),
+        ('DELETE', '/transactions/{id:int}', 'handle_delete'),
+        ('GET', '/alerts', 'handle_alerts'),
+        ('GET', '/metrics', 'handle_metrics', {'startup': True}),
+        ('GET', '/health', 'handle_health', {'auth': False, 'startup': True}),
+        ('GET', '/health/live', 'handle_liveness', {'auth': False, 'startup': True}),
+        ('GET', '/admin/profile', 'handle_profile_dump', {'admin': True}),
+        ('POST', '/admin/archive', 'handle_archive', {'admin': True}),
+    ])
+    
+    # In-memory copy-on-write storage (in production, use a proper database)
+    store = SnapshotStore()
+    
+    # Recent Idempotency-Key responses for POST /transactions
+    idempotency_cache = IdempotencyCache()
+    
+    # Fields clients may change with PUT/PATCH (validated by TRANSACTION_SCHEMA)
+    UPDATABLE_FIELDS = ['type', 'amount', 'sender', 'receiver', 'status', 'reference']
+    
+    # Records parsed per import commit (each commit copies the store's containers once)
+    IMPORT_COMMIT_SIZE = 1000
+    
+    # NumPy columns for /transactions/analytics, built on first use and then
+    # maintained from commits
+    _analytics = (None, None)  # (store, LiveColumns)
+    _analytics_lock = threading.Lock()
+    
+    # Inverted index for /transactions/search, built on first use and then
+    # maintained on every commit
+    _search_index = (None, None)  # (store, SearchIndex)
+    _search_index_lock = threading.Lock()
+    MAX_SEARCH_LIMIT = 1000
     
     # Basic Auth credentials (in production, use proper user management)
     VALID_CREDENTIALS = {
@@ -32,20 +246,358 @@ class TransactionAPIHandler(http.server.BaseHTTPRequestHandler):
         'demo': 'demo123'
     }
     
+    # Users allowed to reach /admin endpoints
+    ADMIN_USERS = {'admin'}
+    
+    # Optional RequestProfiler installed by start_server(--profile)
+    profiler = None
+    
+    # Optional PartitionArchive installed by start_server(--archive-dir)
+    archive = None
+    HOT_PARTITIONS = 2
+    
+    # Per-sender sliding-window rules applied to POST /transactions (None disables them)
+    velocity = VelocityMonitor()
+    
+    # Create/update/delete events for GET /transactions/stream (attached to the store by start_server)
+    change_feed = ChangeFeed()
+    STREAM_HEARTBEAT = 15.0  # seconds between keep-alive comments on an idle stream
+    MAX_STREAM_SUBSCRIBERS = 100  # each open stream holds one server thread
+    _stream_slots = threading.BoundedSemaphore(MAX_STREAM_SUBSCRIBERS)
+    
+    # Structured access log installed by start_server (None falls back to stderr)
+    access_log = None
+    
+    # Optional ResponseCache for GET routes (--response-cache); routes streamed
+    # without a Content-Length cannot be cached
+    response_cache = None
+    UNCACHEABLE_ROUTES = ('/transactions/export', '/transactions/stream')
+    
+    # Background loading progress; until it is ready only routes marked
+    # 'startup' are served and the rest answer 503 (replaced by start_server)
+    startup = StartupState()
+    
     @classmethod
-    def load_data(cls):
-        """Load transaction data from XML file."""
+    def load_data(cls, data_file: Optional[str] = None, lazy_cache_size: Optional[int] = None):
+        """
+        Load transaction data from XML file, reporting progress to cls.startup.
+        
+        A file that cannot be read or parsed is recorded with startup.fail():
+        the store stays empty and the server never reports ready.
+        
+        Args:
+            data_file (str): XML file, defaults to DATA_FILE
+            lazy_cache_size (int): When set, only index record offsets at startup and
+                parse records on first access, keeping at most this many in an LRU cache
+        """
+        data_file = data_file or cls.DATA_FILE
+        startup = cls.startup
         try:
-            parser = TransactionParser('data/modified_sms_v2.xml')
-            cls.transactions_list = parser.parse_xml_to_json()
-            cls.transactions_dict = {t['id']: t for t in cls.transactions_list}
-            if cls.transactions_list:
-                cls.next_id = max(t['id'] for t in cls.transactions_list) + 1
-            print(f"Loaded {len(cls.transactions_list)} transactions from XML")
+            if lazy_cache_size is not None:
+                startup.begin('indexing', os.path.getsize(data_file))
+                index = TransactionFileIndex(data_file, lazy_cache_size, startup.advance)
+                cls.store = SnapshotStore.from_index(index)
+                print(f"Indexed {len(cls.store)} transactions from XML "
+                      f"(lazy, cache of {lazy_cache_size} records)")
+                return
+            startup.begin('loading', os.path.getsize(data_file))
+            parser = TransactionParser(data_file)
+            cls.store = SnapshotStore(parser.parse_xml_to_json(startup.advance, raise_errors=True))
+            startup.skipped = parser.skipped
+            print(f"Loaded {len(cls.store)} transactions from XML"
+                  + (f" ({parser.skipped} invalid skipped)" if parser.skipped else ""))
         except Exception as e:
             print(f"Error loading data: {e}")
-            cls.transactions_list = []
-            cls.transactions_dict = {}
+            startup.fail(f"Error loading data: {e}")
+            cls.store = SnapshotStore()
+    
+    @staticmethod
+    def build_transaction(data: Dict[str, Any], preserve_id: bool = False) -> Dict[str, Any]:
+        """
+        Validate client data against TRANSACTION_SCHEMA into a transaction record.
+        
+        Args:
+            data (Dict): Decoded JSON object or raw XML element fields
+            preserve_id (bool): Keep a client-supplied id instead of leaving it
+                for the store to assign
+            
+        Raises:
+            ValidationError: If a field is missing or invalid
+        """
+        if preserve_id and data.get('id') is not None:
+            return TRANSACTION_SCHEMA.validate(data)
+        return TRANSACTION_SCHEMA.validate(data, exclude=('id',))
+    
+    @classmethod
+    def remove_transaction(cls, transaction_id: int,
+                           expected_version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Remove a transaction from the store and return it.
+        
+        Raises:
+            KeyError: If the transaction does not exist
+            VersionConflict: If expected_version does not match the current version
+        """
+        with cls.store.write() as batch:
+            current_version = batch.record_version(transaction_id)
+            if transaction_id in batch and expected_version not in (None, current_version):
+                raise VersionConflict(current_version)
+            return batch.remove(transaction_id)
+    
+    @classmethod
+    def apply_update(cls, transaction_id: int, changes: Dict[str, Any],
+                     expected_version: Optional[int] = None):
+        """
+        Conditionally apply field changes to a transaction.
+        
+        Only fields whose value actually differs are written, and the reference
+        index is touched only when the reference changes. The version is bumped
+        only if something changed. The record is replaced by an updated copy, so
+        readers of older snapshots keep seeing the previous values.
+        
+        Returns:
+            Tuple[Dict, int, List[str]]: Transaction, its version and the changed fields
+            
+        Raises:
+            KeyError: If the transaction does not exist
+            VersionConflict: If expected_version does not match the current version
+            DuplicateReference: If the new reference belongs to another transaction
+        """
+        with cls.store.write() as batch:
+            transaction = batch.by_id[transaction_id]
+            current_version = batch.record_version(transaction_id)
+            if expected_version is not None and expected_version != current_version:
+                raise VersionConflict(current_version)
+            
+            changed = {field: value for field, value in changes.items()
+                       if transaction.get(field) != value}
+            if not changed:
+                return transaction, current_version, []
+            if 'reference' in changed:
+                existing_id = batch.find_reference(changed['reference'])
+                if existing_id not in (None, transaction_id):
+                    raise DuplicateReference(changed['reference'], existing_id)
+            
+            transaction = {**transaction, **changed}
+            batch.replace(transaction_id, transaction)
+            return transaction, batch.record_version(transaction_id), list(changed)
+    
+    @staticmethod
+    def etag(version: int, fields: Optional[tuple] = None) -> str:
+        """
+        Format a record version as a strong ETag.
+        
+        A sparse fieldset is a different representation of the record, so its
+        ETag also carries a digest of the fields (e.g. "3-1f0e2a9c").
+        """
+        if fields is None:
+            return f'"{version}"'
+        digest = hashlib.sha1(','.join(fields).encode('utf-8')).hexdigest()[:8]
+        return f'"{version}-{digest}"'
+    
+    def conflict_headers(self, conflict: VersionConflict) -> Optional[Dict[str, str]]:
+        """ETag of the current version for a 412, none if the If-Match was malformed."""
+        if conflict.current_version is None:
+            return None
+        return {'ETag': self.etag(conflict.current_version)}
+    
+    def if_none_match(self, etag: str) -> bool:
+        """
+        True if If-None-Match matches the ETag of the current representation.
+        
+        Follows RFC 9110 section 13.1.2: "*" matches any current record;
+        otherwise the header (possibly repeated) is a comma-separated list of
+        entity-tags compared weakly, so a W/ prefix is ignored.
+        """
+        header = ', '.join(self.headers.get_all('If-None-Match', ()))
+        if header.strip() == '*':
+            return True
+        return etag in _ENTITY_TAG.findall(header)
+    
+    def if_match_version(self) -> Optional[int]:
+        """
+        Parse the If-Match header into an expected version.
+        
+        Returns:
+            Optional[int]: Expected version, or None when absent or "*"
+            
+        Raises:
+            VersionConflict: If the header is present but not a valid version ETag
+        """
+        header = self.headers.get('If-Match')
+        if header is None or header.strip() == '*':
+            return None
+        tag = header.split(',')[0].strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        try:
+            # The ETag of a sparse fieldset names the same version
+            return int(tag.strip('"').split('-', 1)[0])
+        except ValueError:
+            raise VersionConflict(None)
+    
+    @classmethod
+    def analytics_columns(cls) -> 'LiveColumns':
+        """Return NumPy columns of the current store, building them on first use."""
+        store, columns = cls._analytics
+        if store is not cls.store:
+            with cls._analytics_lock:
+                store, columns = cls._analytics
+                if store is not cls.store:
+                    from analytics import LiveColumns
+                    store = cls.store
+                    columns = LiveColumns(store)
+                    cls._analytics = (store, columns)
+        return columns
+    
+    @classmethod
+    def search_index(cls) -> SearchIndex:
+        """Return the search index of the current store, building it on first use."""
+        store, index = cls._search_index
+        if store is not cls.store:
+            with cls._search_index_lock:
+                store, index = cls._search_index
+                if store is not cls.store:
+                    store = cls.store
+                    index = SearchIndex.for_store(store)
+                    cls._search_index = (store, index)
+        return index
+    
+    def log_request(self, code='-', size='-'):
+        """Suppress the default per-request line; instrumented() logs a structured record."""
+    
+    def log_message(self, format: str, *args):
+        """Route server messages through the access log writer when configured."""
+        if self.access_log is None:
+            super().log_message(format, *args)
+            return
+        self.access_log.log({
+            'client': self.client_address[0],
+            'level': 'error',
+            'message': format % args
+        })
+    
+    @contextmanager
+    def track_stage(self, stage: str):
+        """Time a block of request handling (auth, store, serialize) for metrics."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings = getattr(self, '_stage_timings', None)
+            if timings is not None:
+                timings.append((stage, time.perf_counter() - start_time))
+    
+    def handle_one_request(self):
+        """Handle one request, keeping the connection open between requests when possible."""
+        self._requests_handled = getattr(self, '_requests_handled', 0) + 1
+        self._connection_header_sent = False
+        self._body_consumed = False
+        self._capture = None
+        self._cache_status = None
+        self.content_length = 0
+        self.chunked = False
+        self.username = None
+        super().handle_one_request()
+        if not self.close_connection:
+            self.discard_unread_body()
+    
+    def parse_request(self) -> bool:
+        """
+        Parse the request line and headers, then how the body is framed.
+        
+        The body ends after Content-Length bytes or, with Transfer-Encoding:
+        chunked, at the last chunk. When its end cannot be known the request
+        is answered with 400 (501 for transfer codings other than chunked)
+        and the connection closed: an invalid Content-Length (not a
+        non-negative integer, or repeated with different values) or both
+        headers at once.
+        """
+        if not super().parse_request():
+            return False
+        values = {value.strip() for value in self.headers.get_all('Content-Length', [])}
+        value = values.pop() if len(values) == 1 else None
+        codings = [coding.strip().lower()
+                   for header in self.headers.get_all('Transfer-Encoding', [])
+                   for coding in header.split(',') if coding.strip()]
+        error = status_code = None
+        if len(values) > 0 or (value is not None and not (value.isascii() and value.isdigit())):
+            error, status_code = 'Invalid Content-Length header', 400
+        elif codings and value is not None:
+            error, status_code = 'Content-Length and Transfer-Encoding must not be combined', 400
+        elif codings and codings[-1] != 'chunked':
+            error, status_code = 'Transfer-Encoding must end with chunked', 400
+        elif len(codings) > 1:
+            error, status_code = f'Unsupported Transfer-Encoding: {", ".join(codings)}', 501
+        if error is not None:
+            self._body_consumed = True
+            self.close_connection = True
+            self.send_error_response(error, status_code)
+            return False
+        self.chunked = bool(codings)
+        self.content_length = int(value or 0)
+        return True
+    
+    def send_response(self, code: int, message: Optional[str] = None):
+        """Send the status line, remembering the code for metrics."""
+        self._status_code = code
+        if getattr(self, '_capture', None) is not None:
+            self._capture['status'] = code
+        super().send_response(code, message)
+    
+    def send_header(self, keyword: str, value: str):
+        """Send a header, noting whether the handler already chose a Connection header."""
+        if keyword.lower() == 'connection':
+            self._connection_header_sent = True
+        if getattr(self, '_capture', None) is not None:
+            self._capture['headers'].append((keyword, value))
+        super().send_header(keyword, value)
+    
+    def end_headers(self):
+        """Announce whether the connection stays open before ending the headers."""
+        if getattr(self, '_cache_status', None) is not None:
+            self.send_header('X-Cache', self._cache_status)
+        if not getattr(self, '_connection_header_sent', False):
+            remaining = self.MAX_KEEPALIVE_REQUESTS - getattr(self, '_requests_handled', 1)
+            if (self.close_connection or remaining <= 0 or
+                    (not getattr(self, '_body_consumed', True) and not self.can_drain_body())):
+                self.send_header('Connection', 'close')
+                self.close_connection = True
+            else:
+                self.send_header('Keep-Alive', f'timeout={self.timeout}, max={remaining}')
+        super().end_headers()
+    
+    def read_body(self) -> bytes:
+        """
+        Read the whole request body (Content-Length or chunked).
+        
+        Raises:
+            MalformedBody: If a chunked body is not framed correctly
+        """
+        if self.chunked:
+            return b''.join(self.iter_request_body())
+        self._body_consumed = True
+        return self.rfile.read(self.content_length)
+    
+    def can_drain_body(self) -> bool:
+        """True if an unread request body is small enough to discard after responding."""
+        if self.chunked:
+            return False
+        return self.content_length <= self.MAX_DRAIN_BYTES
+    
+    def discard_unread_body(self):
+        """Consume a request body the handler never read so the next request parses cleanly."""
+        if self._body_consumed or self.headers is None or not self.can_drain_body():
+            return
+        if self.content_length:
+            self.rfile.read(self.content_length)
+    
+    def write_body(self, payload: bytes):
+        """Write a response body, counting bytes sent for metrics."""
+        if getattr(self, '_capture', None) is not None:
+            self._capture['body'].append(payload)
+        self.wfile.write(payload)
+        self._bytes_sent = getattr(self, '_bytes_sent', 0) + len(payload)
     
     def authenticate(self) -> bool:
         """
@@ -54,6 +606,11 @@ class TransactionAPIHandler(http.server.BaseHTTPRequestHandler):
         Returns:
             bool: True if authenticated, False otherwise
         """
+        with self.track_stage('auth'):
+            return self._check_credentials()
+    
+    def _check_credentials(self) -> bool:
+        """Validate the Authorization header against VALID_CREDENTIALS."""
         auth_header = self.headers.get('Authorization')
         if not auth_header:
             return False
@@ -69,23 +626,44 @@ class TransactionAPIHandler(http.server.BaseHTTPRequestHandler):
             username, password = credentials.split(':', 1)
             
             # Verify credentials
-            return self.VALID_CREDENTIALS.get(username) == password
+            if self.VALID_CREDENTIALS.get(username) == password:
+                self.username = username
+                return True
+            return False
             
         except Exception as e:
-            print(f"Authentication error: {e}")
+            self.log_message("Authentication error: %s", e)
             return False
     
-    def send_json_response(self, data: Any, status_code: int = 200):
+    def send_json_response(self, data: Any, status_code: int = 200,
+                           extra_headers: Optional[Dict[str, str]] = None):
         """Send JSON response with appropriate headers."""
+        with self.track_stage('serialize'):
+            response = json.dumps(data, indent=2).encode('utf-8')
+        
         self.send_response(status_code)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, PATCH, DELETE, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, Idempotency-Key, If-Match, If-None-Match')
         self.end_headers()
-        
-        response = json.dumps(data, indent=2)
-        self.wfile.write(response.encode('utf-8'))
+        self.write_body(response)
+    
+    def send_text_response(self, body: str, content_type: str = 'text/plain; charset=utf-8',
+                           status_code: int = 200):
+        """Send a plain-text response (used for Prometheus metrics)."""
+        self.send_bytes_response(body.encode('utf-8'), content_type, status_code)
+    
+    def send_bytes_response(self, payload: bytes, content_type: str, status_code: int = 200):
+        """Send a raw byte payload with an explicit content type."""
+        self.send_response(status_code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.write_body(payload)
     
     def send_error_response(self, message: str, status_code: int = 400):
         """Send error response."""
@@ -97,231 +675,835 @@ class TransactionAPIHandler(http.server.BaseHTTPRequestHandler):
     
     def send_unauthorized(self):
         """Send 401 Unauthorized response."""
-        self.send_response(401)
-        self.send_header('WWW-Authenticate', 'Basic realm="SMS Transaction API"')
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        
         error_response = {
             'error': 'Unauthorized - Invalid or missing credentials',
             'status_code': 401,
             'message': 'Please provide valid Basic Authentication credentials'
         }
-        self.wfile.write(json.dumps(error_response, indent=2).encode('utf-8'))
+        payload = json.dumps(error_response, indent=2).encode('utf-8')
+        
+        self.send_response(401)
+        self.send_header('WWW-Authenticate', 'Basic realm="SMS Transaction API"')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.write_body(payload)
     
-    def do_OPTIONS(self):
+    @instrumented
+    def do_OPTIONS(self, request: Request):
         """Handle preflight requests for CORS."""
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, PATCH, DELETE, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, Idempotency-Key, If-Match, If-None-Match')
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
-    def do_GET(self):
-        """Handle GET requests."""
-        if not self.authenticate():
+    @instrumented
+    def dispatch(self, request: Request):
+        """Authenticate and call the handler of the matched route."""
+        route = request.route
+        if (route is None or route.auth) and not self.authenticate():
             self.send_unauthorized()
             return
         
-        # Parse URL and query parameters
-        parsed_url = urllib.parse.urlparse(self.path)
-        path_parts = [p for p in parsed_url.path.split('/') if p]
+        if route is None:
+            if request.error:
+                self.send_error_response(request.error, 400)
+            elif request.allowed:
+                self.send_json_response({
+                    'error': f'Method {request.method} not allowed for {request.path}',
+                    'status_code': 405
+                }, 405, {'Allow': ', '.join(request.allowed)})
+            else:
+                self.send_error_response('Invalid endpoint', 404)
+            return
         
-        if not path_parts or path_parts[0] != 'transactions':
-            self.send_error_response('Invalid endpoint', 404)
+        if not route.startup and not self.startup.ready:
+            failed = self.startup.error is not None
+            self.send_json_response({
+                'error': 'Server failed to load its data' if failed else 'Server is starting, data is still loading',
+                'status_code': 503,
+                'startup': self.startup.status()
+            }, 503, None if failed else {'Retry-After': '1'})
             return
         
-        # GET /transactions - List all transactions
-        if len(path_parts) == 1:
-            query_params = urllib.parse.parse_qs(parsed_url.query)
-            
-            # Optional filtering by status, type, etc.
-            filtered_transactions = self.transactions_list.copy()
-            
-            if 'status' in query_params:
-                status_filter = query_params['status'][0].upper()
-                filtered_transactions = [t for t in filtered_transactions 
-                                       if t['status'] == status_filter]
-            
-            if 'type' in query_params:
-                type_filter = query_params['type'][0].upper()
-                filtered_transactions = [t for t in filtered_transactions 
-                                       if t['type'] == type_filter]
-            
-            response_data = {
-                'transactions': filtered_transactions,
-                'total_count': len(filtered_transactions),
-                'message': 'Transactions retrieved successfully'
-            }
-            self.send_json_response(response_data)
+        if route.admin and self.username not in self.ADMIN_USERS:
+            self.send_error_response('Admin privileges required', 403)
+            return
+        
+        try:
+            cache = self.response_cache
+            if (cache is not None and route.label in cache.routes and request.method == 'GET'
+                    and 'If-None-Match' not in self.headers):
+                self.serve_cached(cache, route.handler, request)
+            else:
+                getattr(self, route.handler)(request)
+        except InvalidRecordError as e:
+            # A --lazy data file record that fails validation when first read
+            self.log_message("%s", e)
+            if self._status_code is None:
+                self.send_error_response(f'Server error: {e}', 500)
+            else:
+                # The response has started; drop the connection so the client
+                # sees a truncated body rather than a complete one
+                self.close_connection = True
+        except MalformedBody as e:
+            # Raised by read_body() outside a handler's own error handling;
+            # iter_request_body() has already marked the connection for closing
+            if self._status_code is None:
+                self.send_error_response(f'Malformed request body: {e}', 400)
+    
+    def serve_cached(self, cache: ResponseCache, handler: str, request: Request):
+        """
+        Answer from the response cache, or run the handler and store its response.
+        
+        Concurrent requests with the same key wait for the first one and
+        replay its response; a commit since the response was stored makes it
+        a miss. The outcome is sent as the X-Cache header.
+        """
+        key = cache.key(self.username, request.parts, request.query)
+        version = self.store.snapshot.version
+        outcome, response = cache.begin(key, version)
+        METRICS.inc('response_cache_requests_total', route=request.label, result=outcome)
+        self._cache_status = outcome.upper()
+        if response is not None:
+            self.send_cached_response(response)
+            return
+        if outcome == ResponseCache.BYPASS:
+            getattr(self, handler)(request)
+            return
+        
+        self._capture = capture = {'status': None, 'headers': [], 'body': []}
+        try:
+            getattr(self, handler)(request)
+        finally:
+            self._capture = None
+            cache.complete(key, capture['status'], capture['headers'], b''.join(capture['body']))
+    
+    def send_cached_response(self, response: CachedResponse):
+        """Replay a stored response with its age."""
+        self.send_response(response.status)
+        for name, value in response.headers:
+            self.send_header(name, value)
+        self.send_header('Age', str(int(time.monotonic() - response.stored_at)))
+        self.end_headers()
+        self.write_body(response.body)
+    
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = dispatch
+    
+    def handle_alerts(self, request: Request):
+        """
+        GET /alerts - Recent velocity rule breaches, newest first.
+        
+        Query parameters:
+            sender: only alerts for this sender
+            limit: maximum number of alerts returned (default 100)
+        """
+        if self.velocity is None:
+            self.send_error_response('Velocity rules are disabled - start the server without --no-velocity', 404)
+            return
+        query_params = request.query
+        try:
+            limit = int(query_params.get('limit', ['100'])[0])
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            self.send_error_response('limit must be a positive integer', 400)
+            return
+        
+        alerts = self.velocity.recent_alerts(query_params.get('sender', [None])[0], limit)
+        self.send_json_response({
+            'alerts': alerts,
+            'total_count': len(alerts),
+            'rules': [{
+                'name': rule.name,
+                'window_seconds': rule.window_seconds,
+                'max_count': rule.max_count,
+                'max_amount': rule.max_amount,
+                'action': rule.action
+            } for rule in self.velocity.rules],
+            'message': 'Alerts retrieved successfully'
+        })
+    
+    def handle_health(self, request: Request):
+        """
+        GET /health - Readiness probe (no authentication).
+        
+        200 once the data is loaded; 503 with load progress before that.
+        """
+        status = self.startup.status()
+        if status['status'] == 'ready':
+            status['transactions'] = len(self.store)
+            self.send_json_response(status)
+        else:
+            self.send_json_response(status, 503, {'Retry-After': '1'})
+    
+    def handle_liveness(self, request: Request):
+        """GET /health/live - Liveness probe: 200 as soon as the server accepts requests."""
+        self.send_json_response(self.startup.status())
+    
+    def handle_metrics(self, request: Request):
+        """GET /metrics - Prometheus exposition of request metrics."""
+        self.send_text_response(METRICS.render(), 'text/plain; version=0.0.4; charset=utf-8')
+    
+    def handle_list(self, request: Request):
+        """GET /transactions - List transactions with optional filters and sparse fields."""
+        query_params = request.query
+        try:
+            fields = parse_fields(query_params)
+            since, until = parse_time_range(query_params)
+        except ValueError as e:
+            self.send_error_response(str(e), 400)
+            return
+        
+        # Optional filtering by status, type and time range
+        with self.track_stage('store'):
+            filtered_transactions = list(self.iter_filtered(query_params, since, until))
+        
+        # Optional sparse fieldset (?fields=id,amount,status)
+        if fields is not None:
+            with self.track_stage('serialize'):
+                project = projection_serializer(fields)
+                filtered_transactions = [project(t) for t in filtered_transactions]
+        
+        response_data = {
+            'transactions': filtered_transactions,
+            'total_count': len(filtered_transactions),
+            'message': 'Transactions retrieved successfully'
+        }
+        self.send_json_response(response_data)
+    
+    def handle_get(self, request: Request):
+        """GET /transactions/{id} - Get a specific transaction (ETag / If-None-Match aware)."""
+        try:
+            fields = parse_fields(request.query)
+        except ValueError as e:
+            self.send_error_response(str(e), 400)
+            return
+        
+        transaction_id = request.params['id']
+        with self.track_stage('store'):
+            snapshot = self.store.snapshot
+            version = snapshot.record_version(transaction_id)
+            transaction = snapshot.get(transaction_id)
+        
+        if not transaction:
+            self.send_error_response('Transaction not found', 404)
+            return
+        
+        etag = self.etag(version, fields)
+        if self.if_none_match(etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        if fields is not None:
+            transaction = projection_serializer(fields)(transaction)
+        response_data = {
+            'transaction': transaction,
+            'message': 'Transaction found'
+        }
+        self.send_json_response(response_data, extra_headers={'ETag': etag})
+    
+    def iter_filtered(self, query_params: Dict[str, List[str]],
+                      since: Optional[float] = None, until: Optional[float] = None):
+        """
+        Lazily yield transactions matching the status/type query filters.
+        
+        Iterates over the snapshot current when iteration starts, so writes made
+        while a long response is streaming are not picked up half-way. With a
+        since/until range (epoch seconds), archived partitions outside the range
+        are skipped without being read.
+        """
+        snapshot = self.store.snapshot
+        status_filter = query_params['status'][0].upper() if 'status' in query_params else None
+        type_filter = query_params['type'][0].upper() if 'type' in query_params else None
+        time_filter = since is not None or until is not None
+        
+        for transaction in snapshot.scan(since, until):
+            if status_filter is not None and transaction['status'] != status_filter:
+                continue
+            if type_filter is not None and transaction['type'] != type_filter:
+                continue
+            if time_filter:
+                timestamp = parse_timestamp(transaction.get('timestamp'))
+                if timestamp is None or (since is not None and timestamp < since) or (
+                        until is not None and timestamp > until):
+                    continue
+            yield transaction
+    
+    def handle_export(self, request: Request):
+        """
+        Stream all (optionally filtered) transactions as NDJSON or CSV.
+        
+        Query parameters:
+            format: ndjson (default) or csv
+            status, type, since, until: same filters as GET /transactions
+            fields: sparse fieldset / CSV columns
+        """
+        query_params = request.query
+        output_format = query_params.get('format', ['ndjson'])[0]
+        if output_format not in ('ndjson', 'csv'):
+            self.send_error_response('Invalid format, expected ndjson or csv', 400)
+            return
+        try:
+            fields = parse_fields(query_params)
+            since, until = parse_time_range(query_params)
+        except ValueError as e:
+            self.send_error_response(str(e), 400)
+            return
+        
+        transactions = self.iter_filtered(query_params, since, until)
+        if output_format == 'csv':
+            chunks = iter_csv(transactions, list(fields or EXPORT_FIELDS))
+            content_type = 'text/csv; charset=utf-8'
+        else:
+            if fields is not None:
+                project = projection_serializer(fields)
+                transactions = (project(t) for t in transactions)
+            chunks = iter_ndjson(transactions)
+            content_type = 'application/x-ndjson'
+        
+        self.send_stream_response((chunk.encode('utf-8') for chunk in chunks), content_type, {
+            'Content-Disposition': f'attachment; filename="transactions.{output_format}"'
+        })
+    
+    def handle_search(self, request: Request):
+        """
+        GET /transactions/search - Full-text search over reference, sender, receiver, type and status.
+        
+        Query parameters:
+            q: search terms; every term must prefix-match a token of the record
+            limit: maximum number of transactions returned (default 50, max 1000)
+            fields: sparse fieldset
+        """
+        query_params = request.query
+        query = query_params.get('q', [''])[0]
+        if not query.strip():
+            self.send_error_response('Missing query parameter: q', 400)
+            return
+        try:
+            limit = int(query_params.get('limit', ['50'])[0])
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= self.MAX_SEARCH_LIMIT:
+            self.send_error_response(f'limit must be an integer from 1 to {self.MAX_SEARCH_LIMIT}', 400)
+            return
+        try:
+            fields = parse_fields(query_params)
+        except ValueError as e:
+            self.send_error_response(str(e), 400)
             return
         
-        # GET /transactions/{id} - Get specific transaction
-        if len(path_parts) == 2:
-            try:
-                transaction_id = int(path_parts[1])
-                transaction = self.transactions_dict.get(transaction_id)
-                
-                if transaction:
-                    response_data = {
-                        'transaction': transaction,
-                        'message': 'Transaction found'
-                    }
-                    self.send_json_response(response_data)
+        with self.track_stage('search'):
+            matches = self.search_index().search(query)
+        
+        with self.track_stage('store'):
+            snapshot = self.store.snapshot
+            transactions = []
+            for transaction_id in matches:
+                transaction = snapshot.get(transaction_id)
+                if transaction is not None:
+                    transactions.append(transaction)
+                    if len(transactions) >= limit:
+                        break
+        
+        if fields is not None:
+            project = projection_serializer(fields)
+            transactions = [project(t) for t in transactions]
+        
+        self.send_json_response({
+            'transactions': transactions,
+            'total_count': len(matches),
+            'query': query,
+            'message': 'Search completed'
+        })
+    
+    def handle_stream(self, request: Request):
+        """
+        GET /transactions/stream - Server-Sent Events feed of transaction changes.
+        
+        Sends created/updated/deleted events as they are committed. Clients resume
+        after a reconnect with the Last-Event-ID header (or ?last_event_id=); if that
+        event has left the buffer a "reset" event tells them to re-fetch the list.
+        """
+        last_event_id = self.headers.get('Last-Event-ID') or request.query.get('last_event_id', [None])[0]
+        try:
+            position = self.change_feed.last_id if last_event_id is None else int(last_event_id)
+        except ValueError:
+            self.send_error_response(f'Invalid Last-Event-ID: {last_event_id}', 400)
+            return
+        if not self._stream_slots.acquire(blocking=False):
+            self.send_error_response('Too many open event streams', 503)
+            return
+        
+        def events(position: int):
+            yield b'retry: 3000\n\n'
+            while True:
+                frames, position = self.change_feed.read(position, self.STREAM_HEARTBEAT)
+                if frames is None:
+                    yield b'id: %d\nevent: reset\ndata: {}\n\n' % position
+                elif frames:
+                    yield b''.join(frames)
                 else:
-                    self.send_error_response('Transaction not found', 404)
-                return
-                
-            except ValueError:
-                self.send_error_response('Invalid transaction ID format', 400)
+                    yield b': keep-alive\n\n'
+        
+        try:
+            self.send_stream_response(events(position), 'text/event-stream; charset=utf-8',
+                                      {'Cache-Control': 'no-cache'}, buffer_size=0)
+        except (ConnectionError, TimeoutError):
+            # The subscriber went away or stopped reading; the stream only ends this way
+            self.close_connection = True
+        finally:
+            self._stream_slots.release()
+    
+    def send_stream_response(self, chunks, content_type: str,
+                             extra_headers: Optional[Dict[str, str]] = None,
+                             buffer_size: int = 64 * 1024):
+        """
+        Stream a response body of unknown length from an iterable of byte chunks.
+        
+        Chunks are coalesced into writes of at most buffer_size bytes so memory
+        stays bounded regardless of the export size (0 writes every chunk as it
+        arrives). HTTP/1.1 clients get chunked
+        transfer encoding and keep the connection; HTTP/1.0 clients read until close.
+        """
+        chunked = self.request_version != 'HTTP/1.0'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        
+        def flush(data: bytes):
+            self.write_body(b'%x\r\n%s\r\n' % (len(data), data) if chunked else data)
+        
+        pending = []
+        pending_size = 0
+        for chunk in chunks:
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= buffer_size:
+                flush(b''.join(pending))
+                pending = []
+                pending_size = 0
+        if pending:
+            flush(b''.join(pending))
+        if chunked:
+            self.write_body(b'0\r\n\r\n')
+    
+    def iter_request_body(self, chunk_size: int = 64 * 1024):
+        """
+        Yield the request body in chunks without buffering it whole.
+        
+        Supports both Content-Length and Transfer-Encoding: chunked uploads.
+        
+        Raises:
+            MalformedBody: If a chunked body is not framed correctly; the
+                connection is closed since the next request cannot be found
+        """
+        self._body_consumed = True
+        if self.chunked:
+            while True:
+                size_line = self.rfile.readline(1024)
+                size_field = size_line.split(b';', 1)[0].strip()
+                if not _CHUNK_SIZE.fullmatch(size_field):
+                    self.close_connection = True
+                    raise MalformedBody(f"Invalid chunk size line: {size_line[:40]!r}")
+                size = int(size_field, 16)
+                if size == 0:
+                    # Consume optional trailers up to the terminating blank line
+                    while True:
+                        line = self.rfile.readline(1024)
+                        if line in (b'\r\n', b'\n'):
+                            return
+                        if not line:
+                            self.close_connection = True
+                            raise MalformedBody("Chunked body ended without its last chunk")
+                remaining = size
+                while remaining > 0:
+                    data = self.rfile.read(min(chunk_size, remaining))
+                    if not data:
+                        self.close_connection = True
+                        raise MalformedBody("Chunked body ended inside a chunk")
+                    remaining -= len(data)
+                    yield data
+                if self.rfile.readline(1024) not in (b'\r\n', b'\n'):
+                    self.close_connection = True
+                    raise MalformedBody("Missing CRLF after chunk data")
+        
+        remaining = self.content_length
+        while remaining > 0:
+            data = self.rfile.read(min(chunk_size, remaining))
+            if not data:
                 return
+            remaining -= len(data)
+            yield data
+    
+    @staticmethod
+    def iter_ndjson_records(chunks):
+        """Split a byte chunk stream into decoded NDJSON records (blank lines skipped)."""
+        pending = b''
+        for chunk in chunks:
+            pending += chunk
+            *lines, pending = pending.split(b'\n')
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+        if pending.strip():
+            yield json.loads(pending)
+    
+    def handle_import(self, request: Request):
+        """
+        Import transactions from a streamed sms_transactions XML or NDJSON body.
         
-        self.send_error_response('Invalid endpoint', 404)
+        The body is parsed incrementally while records are inserted, so uploads of
+        any size are never held in memory at once.
+        
+        Query parameters:
+            format: xml or ndjson (defaults from Content-Type, else xml)
+            ids: assign (default, new IDs for every record) or preserve
+                 (keep incoming IDs, skipping ones that already exist)
+        """
+        query_params = request.query
+        content_type = self.headers.get('Content-Type', '')
+        default_format = 'ndjson' if 'ndjson' in content_type or 'jsonl' in content_type else 'xml'
+        input_format = query_params.get('format', [default_format])[0]
+        id_mode = query_params.get('ids', ['assign'])[0]
+        if input_format not in ('xml', 'ndjson') or id_mode not in ('assign', 'preserve'):
+            self.send_error_response('Invalid format (xml|ndjson) or ids (assign|preserve)', 400)
+            return
+        
+        body = self.iter_request_body()
+        if input_format == 'xml':
+            records = TransactionParser.iter_parse_stream(body, validate=False)
+        else:
+            records = self.iter_ndjson_records(body)
+        
+        imported = 0
+        skipped = 0
+        errors = []
+        record_number = 0
+        pending = []
+        parse_error = None
+        # Records are parsed and validated without holding the store's write
+        # lock, then committed in batches so a slow upload never blocks writers
+        try:
+            for record_number, data in enumerate(records, 1):
+                try:
+                    pending.append(self.build_transaction(data, id_mode == 'preserve'))
+                except ValidationError as e:
+                    skipped += 1
+                    if len(errors) < 20:
+                        errors.append({'record': record_number, 'field': e.field, 'error': str(e)})
+                    continue
+                if len(pending) >= self.IMPORT_COMMIT_SIZE:
+                    inserted = self.commit_import(pending)
+                    imported += inserted
+                    skipped += len(pending) - inserted
+                    pending = []
+        except (ET.ParseError, json.JSONDecodeError, ValueError) as e:
+            parse_error = e
+        if pending:
+            inserted = self.commit_import(pending)
+            imported += inserted
+            skipped += len(pending) - inserted
+        
+        if parse_error is not None:
+            self.close_connection = True
+            self.send_json_response({
+                'error': f'Malformed {input_format.upper()} after record {record_number}: {parse_error}',
+                'status_code': 400,
+                'imported': imported,
+                'skipped': skipped
+            }, 400)
+            return
+        
+        self.send_json_response({
+            'message': 'Import completed',
+            'format': input_format,
+            'imported': imported,
+            'skipped': skipped,
+            'errors': errors,
+            'total_count': len(self.store)
+        }, 201 if imported else 200)
     
-    def do_POST(self):
-        """Handle POST requests - Create new transaction."""
-        if not self.authenticate():
-            self.send_unauthorized()
+    def commit_import(self, transactions: List[Dict[str, Any]]) -> int:
+        """
+        Insert a batch of imported transactions in one store commit.
+        
+        Records whose ID (when preserved) or reference already exists are skipped.
+        
+        Returns:
+            int: Number of transactions inserted
+        """
+        inserted = 0
+        with self.track_stage('store'), self.store.write() as batch:
+            for transaction in transactions:
+                if transaction['id'] is not None and transaction['id'] in batch:
+                    continue
+                if batch.find_reference(transaction['reference']) is not None:
+                    continue
+                batch.insert(transaction)
+                inserted += 1
+        return inserted
+    
+    def handle_analytics(self, request: Request):
+        """
+        Return aggregate statistics computed with NumPy over column arrays.
+        
+        Query parameters:
+            group_by: type (default), status, sender or receiver
+            bucket: hour, day (default), week or month
+            bins: number of amount histogram bins (default 10)
+            limit: maximum number of groups returned (default 20)
+            status, type, sender, receiver: equality filters
+        """
+        from analytics import NUMPY_AVAILABLE, TIME_BUCKETS, CATEGORICAL_FIELDS
+        
+        query_params = request.query
+        if not NUMPY_AVAILABLE:
+            self.send_error_response('Analytics requires NumPy on the server (pip install numpy)', 501)
+            return
+        
+        group_by = query_params.get('group_by', ['type'])[0]
+        bucket = query_params.get('bucket', ['day'])[0]
+        if group_by not in CATEGORICAL_FIELDS:
+            self.send_error_response(f'Invalid group_by, expected one of {list(CATEGORICAL_FIELDS)}', 400)
+            return
+        if bucket not in TIME_BUCKETS:
+            self.send_error_response(f'Invalid bucket, expected one of {list(TIME_BUCKETS)}', 400)
+            return
+        try:
+            bins = int(query_params.get('bins', ['10'])[0])
+            limit = int(query_params.get('limit', ['20'])[0])
+            if bins < 1 or limit < 1:
+                raise ValueError
+        except ValueError:
+            self.send_error_response('bins and limit must be positive integers', 400)
             return
         
-        # Parse URL
-        parsed_url = urllib.parse.urlparse(self.path)
-        path_parts = [p for p in parsed_url.path.split('/') if p]
+        filters = {}
+        for field in CATEGORICAL_FIELDS:
+            if field in query_params:
+                value = query_params[field][0]
+                filters[field] = value.upper() if field in ('type', 'status') else value
         
-        if len(path_parts) != 1 or path_parts[0] != 'transactions':
-            self.send_error_response('Invalid endpoint for POST', 404)
+        with self.track_stage('store'):
+            report = self.analytics_columns().report(group_by, bucket, bins, limit, **filters)
+        report['message'] = 'Analytics computed successfully'
+        self.send_json_response(report)
+    
+    def handle_profile_dump(self, request: Request):
+        """
+        Return profiles collected by the request profiler (admin only).
+        
+        Query parameters:
+            format: summary (default), pstats, text or collapsed
+            route: restrict output to one route template
+            reset: discard collected profiles after dumping when "1"
+        """
+        query_params = request.query
+        profiler = self.profiler
+        if profiler is None:
+            self.send_error_response('Profiling is disabled - start the server with --profile', 404)
             return
         
+        output_format = query_params.get('format', ['summary'])[0]
+        route = query_params.get('route', [None])[0]
+        
+        if output_format == 'summary':
+            self.send_json_response(profiler.summary())
+        elif output_format in ('pstats', 'text') and profiler.mode == 'cprofile':
+            if output_format == 'pstats':
+                self.send_bytes_response(profiler.pstats_dump(route), 'application/octet-stream')
+            else:
+                self.send_text_response(profiler.pstats_text(route))
+        elif output_format == 'collapsed' and profiler.mode == 'sampler':
+            self.send_text_response(profiler.collapsed_stacks(route))
+        else:
+            self.send_error_response(
+                f'Format {output_format!r} is not available in {profiler.mode} mode', 400)
+            return
+        
+        if query_params.get('reset', ['0'])[0] == '1':
+            profiler.reset()
+    
+    def handle_archive(self, request: Request):
+        """Move all but the newest HOT_PARTITIONS partitions to the on-disk archive (admin only)."""
+        archive = self.archive
+        if archive is None:
+            self.send_error_response('Archiving is disabled - start the server with --archive-dir', 404)
+            return
+        
+        with self.track_stage('store'):
+            moved = self.store.archive_partitions(archive, self.HOT_PARTITIONS)
+        self.send_json_response({
+            'message': 'Archive updated',
+            'moved': moved,
+            'archived_count': len(archive),
+            'in_memory_count': len(self.store) - len(archive),
+            'partitions': {key: {field: meta[field] for field in ('count', 'min_id', 'max_id', 'bytes')}
+                           for key, meta in sorted(archive.partitions.items())}
+        })
+    
+    def handle_create(self, request: Request):
+        """POST /transactions - Create a new transaction (Idempotency-Key aware)."""
         # Read and parse request body
+        post_data = self.read_body()
+        
+        # Idempotency-Key: replay the stored response for client retries
+        cache_key = None
+        idempotency_key = self.headers.get('Idempotency-Key')
+        if idempotency_key:
+            cache_key = (self.username, idempotency_key)
+            fingerprint = hashlib.sha256(post_data).hexdigest()
+            outcome, stored_response = self.idempotency_cache.begin(cache_key, fingerprint)
+            if outcome == IdempotencyCache.REPLAY:
+                status_code, response_data = stored_response
+                self.send_json_response(response_data, status_code, {'Idempotent-Replayed': 'true'})
+                return
+            if outcome == IdempotencyCache.IN_PROGRESS:
+                self.send_error_response('A request with this Idempotency-Key is still in progress', 409)
+                return
+            if outcome == IdempotencyCache.MISMATCH:
+                self.send_error_response('Idempotency-Key was already used with a different request body', 422)
+                return
+        
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            post_data = self.rfile.read(content_length).decode('utf-8')
-            new_transaction_data = json.loads(post_data)
-            
-            # Validate required fields
-            required_fields = ['type', 'amount', 'sender', 'receiver', 'reference']
-            for field in required_fields:
-                if field not in new_transaction_data:
-                    self.send_error_response(f'Missing required field: {field}', 400)
-                    return
-            
-            # Create new transaction with auto-generated ID and timestamp
-            from datetime import datetime
-            
-            new_transaction = {
-                'id': self.next_id,
-                'type': new_transaction_data['type'].upper(),
-                'amount': float(new_transaction_data['amount']),
-                'sender': new_transaction_data['sender'],
-                'receiver': new_transaction_data['receiver'],
-                'timestamp': new_transaction_data.get('timestamp', 
-                                                    datetime.utcnow().isoformat() + 'Z'),
-                'reference': new_transaction_data['reference'],
-                'status': new_transaction_data.get('status', 'PENDING').upper()
-            }
-            
-            # Add to storage
-            self.transactions_list.append(new_transaction)
-            self.transactions_dict[new_transaction['id']] = new_transaction
-            self.next_id += 1
-            
-            response_data = {
-                'message': 'Transaction created successfully',
-                'transaction': new_transaction
-            }
-            self.send_json_response(response_data, 201)
-            
+            status_code, response_data = self.create_from_body(post_data)
         except json.JSONDecodeError:
-            self.send_error_response('Invalid JSON data', 400)
+            status_code, response_data = 400, {'error': 'Invalid JSON data', 'status_code': 400}
+        except ValidationError as e:
+            status_code, response_data = 400, {'error': str(e), 'field': e.field, 'status_code': 400}
         except ValueError as e:
-            self.send_error_response(f'Invalid data format: {str(e)}', 400)
+            status_code, response_data = 400, {'error': f'Invalid data format: {str(e)}', 'status_code': 400}
         except Exception as e:
-            self.send_error_response(f'Server error: {str(e)}', 500)
+            status_code, response_data = 500, {'error': f'Server error: {str(e)}', 'status_code': 500}
+        
+        if cache_key is not None:
+            if status_code < 300:
+                self.idempotency_cache.complete(cache_key, status_code, response_data)
+            else:
+                self.idempotency_cache.release(cache_key)
+        self.send_json_response(response_data, status_code)
     
-    def do_PUT(self):
-        """Handle PUT requests - Update existing transaction."""
-        if not self.authenticate():
-            self.send_unauthorized()
-            return
+    def create_from_body(self, post_data: bytes):
+        """
+        Create a transaction from a POST body, deduplicating on reference.
         
-        # Parse URL
-        parsed_url = urllib.parse.urlparse(self.path)
-        path_parts = [p for p in parsed_url.path.split('/') if p]
+        Returns:
+            Tuple[int, Dict]: Status code and response data
+        """
+        new_transaction_data = json.loads(post_data.decode('utf-8'))
         
-        if len(path_parts) != 2 or path_parts[0] != 'transactions':
-            self.send_error_response('Invalid endpoint for PUT', 404)
-            return
+        # Validate and normalize; the ID is assigned on insert
+        new_transaction = self.build_transaction(new_transaction_data)
+        
+        # Add to storage, unless a retry already stored this reference
+        # (the check and insert share one commit so concurrent retries cannot both insert)
+        hits = []
+        with self.track_stage('store'), self.store.write() as batch:
+            existing_id = batch.find_reference(new_transaction['reference'])
+            if existing_id is not None:
+                return 200, {
+                    'message': 'Transaction with this reference already exists',
+                    'transaction': batch.get(existing_id)
+                }
+            # Velocity rules see each new transaction once, in commit order
+            if self.velocity is not None:
+                hits = self.velocity.check(new_transaction['sender'], new_transaction['amount'])
+                if any(hit['action'] == 'hold' for hit in hits):
+                    new_transaction['status'] = 'HELD'
+            batch.insert(new_transaction)
         
+        response_data = {
+            'message': 'Transaction created successfully',
+            'transaction': new_transaction
+        }
+        if hits:
+            for hit in hits:
+                METRICS.inc('velocity_alerts_total', rule=hit['rule'], action=hit['action'])
+            response_data['alerts'] = self.velocity.record(hits, new_transaction)
+            if new_transaction['status'] == 'HELD':
+                response_data['message'] = 'Transaction created and held for review'
+        return 201, response_data
+    
+    def handle_update(self, request: Request):
+        """
+        PUT/PATCH /transactions/{id} - Update a transaction with optional If-Match.
+        
+        PATCH responses also list the fields that actually changed.
+        """
         try:
-            transaction_id = int(path_parts[1])
+            transaction_id = request.params['id']
             
-            if transaction_id not in self.transactions_dict:
+            if transaction_id not in self.store.snapshot:
                 self.send_error_response('Transaction not found', 404)
                 return
             
             # Read and parse request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            put_data = self.rfile.read(content_length).decode('utf-8')
+            put_data = self.read_body().decode('utf-8')
             update_data = json.loads(put_data)
             
-            # Update transaction
-            transaction = self.transactions_dict[transaction_id]
-            
-            # Update allowed fields
-            updatable_fields = ['type', 'amount', 'sender', 'receiver', 'status', 'reference']
-            for field in updatable_fields:
-                if field in update_data:
-                    if field in ['type', 'status']:
-                        transaction[field] = update_data[field].upper()
-                    elif field == 'amount':
-                        transaction[field] = float(update_data[field])
-                    else:
-                        transaction[field] = update_data[field]
+            # Validate and normalize the allowed fields present in the body
+            changes = TRANSACTION_SCHEMA.validate_partial(update_data, self.UPDATABLE_FIELDS)
             
-            # Update in list as well
-            for i, t in enumerate(self.transactions_list):
-                if t['id'] == transaction_id:
-                    self.transactions_list[i] = transaction
-                    break
+            with self.track_stage('store'):
+                transaction, version, changed_fields = self.apply_update(
+                    transaction_id, changes, self.if_match_version())
             
             response_data = {
                 'message': 'Transaction updated successfully',
                 'transaction': transaction
             }
-            self.send_json_response(response_data)
+            if request.method == 'PATCH':
+                response_data['changed_fields'] = changed_fields
+            self.send_json_response(response_data, extra_headers={'ETag': self.etag(version)})
             
-        except ValueError as e:
-            self.send_error_response(f'Invalid transaction ID or data: {str(e)}', 400)
+        except KeyError:
+            self.send_error_response('Transaction not found', 404)
+        except VersionConflict as e:
+            self.send_json_response({
+                'error': 'Transaction was modified by another request (If-Match failed)',
+                'status_code': 412,
+                'current_version': e.current_version
+            }, 412, self.conflict_headers(e))
+        except DuplicateReference as e:
+            self.send_json_response({
+                'error': 'Transaction with this reference already exists',
+                'status_code': 409,
+                'field': 'reference',
+                'existing_id': e.existing_id
+            }, 409)
         except json.JSONDecodeError:
             self.send_error_response('Invalid JSON data', 400)
+        except ValidationError as e:
+            self.send_json_response({'error': str(e), 'field': e.field, 'status_code': 400}, 400)
+        except (ValueError, AttributeError) as e:
+            self.send_error_response(f'Invalid transaction ID or data: {str(e)}', 400)
         except Exception as e:
             self.send_error_response(f'Server error: {str(e)}', 500)
     
-    def do_DELETE(self):
-        """Handle DELETE requests - Delete transaction."""
-        if not self.authenticate():
-            self.send_unauthorized()
-            return
-        
-        # Parse URL
-        parsed_url = urllib.parse.urlparse(self.path)
-        path_parts = [p for p in parsed_url.path.split('/') if p]
-        
-        if len(path_parts) != 2 or path_parts[0] != 'transactions':
-            self.send_error_response('Invalid endpoint for DELETE', 404)
-            return
-        
+    def handle_delete(self, request: Request):
+        """DELETE /transactions/{id} - Delete a transaction with optional If-Match."""
         try:
-            transaction_id = int(path_parts[1])
+            transaction_id = request.params['id']
             
-            if transaction_id not in self.transactions_dict:
+            if transaction_id not in self.store.snapshot:
                 self.send_error_response('Transaction not found', 404)
                 return
             
-            # Remove from both storage structures
-            deleted_transaction = self.transactions_dict.pop(transaction_id)
-            self.transactions_list = [t for t in self.transactions_list 
-                                    if t['id'] != transaction_id]
+            # Remove from all storage structures
+            with self.track_stage('store'):
+                deleted_transaction = self.remove_transaction(transaction_id, self.if_match_version())
             
             response_data = {
                 'message': 'Transaction deleted successfully',
@@ -329,23 +1511,88 @@ class TransactionAPIHandler(http.server.BaseHTTPRequestHandler):
             }
             self.send_json_response(response_data)
             
-        except ValueError:
-            self.send_error_response('Invalid transaction ID format', 400)
+        except KeyError:
+            self.send_error_response('Transaction not found', 404)
+        except VersionConflict as e:
+            self.send_json_response({
+                'error': 'Transaction was modified by another request (If-Match failed)',
+                'status_code': 412,
+                'current_version': e.current_version
+            }, 412, self.conflict_headers(e))
         except Exception as e:
             self.send_error_response(f'Server error: {str(e)}', 500)
 
 
-def start_server(port: int = 8000):
-    """Start the REST API server."""
-    print("Starting SMS Transaction REST API Server...")
+def prepare_data(data_file: Optional[str] = None, lazy_cache_size: Optional[int] = None,
+                 archive: Optional[PartitionArchive] = None, hot_partitions: int = 2):
+    """
+    Load the data file and set up everything attached to the store, then mark
+    the server ready. Runs on a background thread while the server already
+    answers GET /health. If any step fails the server stays not ready: GET
+    /health answers 503 with the error and other routes keep returning 503.
+    """
+    handler = TransactionAPIHandler
     
     # Load transaction data
-    TransactionAPIHandler.load_data()
+    handler.load_data(data_file, lazy_cache_size)
+    if handler.startup.error is not None:
+        print("Start-up failed; the server will not become ready")
+        return
+    handler.store.add_listener(handler.change_feed.publish)
+    
+    # Spill cold partitions to disk
+    if archive is not None:
+        handler.startup.begin('archiving')
+        handler.archive = archive
+        handler.HOT_PARTITIONS = hot_partitions
+        try:
+            moved = handler.store.archive_partitions(archive, hot_partitions)
+        except Exception as e:
+            print(f"Error archiving partitions: {e}")
+            handler.startup.fail(f"Error archiving partitions: {e}")
+            print("Start-up failed; the server will not become ready")
+            return
+        print(f"Archived {moved} transactions in {len(archive.partitions)} {archive.granularity} "
+              f"partitions to {archive.directory}")
+    
+    handler.startup.finish(len(handler.store))
+    print(f"Ready in {handler.startup.ready_at - handler.startup.started_at:.2f}s "
+          f"with {len(handler.store)} transactions")
+    
+    # Import NumPy for /transactions/analytics now rather than on its first request
+    import analytics  # noqa: F401
+
+
+def start_server(port: int = 8000, profiler: Optional[RequestProfiler] = None,
+                 access_log: Optional[AccessLogWriter] = None, data_file: Optional[str] = None,
+                 lazy_cache_size: Optional[int] = None, archive: Optional[PartitionArchive] = None,
+                 hot_partitions: int = 2, response_cache: Optional[ResponseCache] = None):
+    """
+    Start the REST API server.
+    
+    The socket is bound first and the data loaded on a background thread
+    (prepare_data), so GET /health answers immediately; other routes return
+    503 until loading finishes.
+    """
+    print("Starting SMS Transaction REST API Server...")
+    
+    TransactionAPIHandler.profiler = profiler
+    TransactionAPIHandler.access_log = access_log or AccessLogWriter()
+    TransactionAPIHandler.startup = StartupState(ready=False)
+    TransactionAPIHandler.response_cache = response_cache
+    if profiler is not None:
+        print(f"Profiling {profiler.sample_rate:.1%} of requests ({profiler.mode} mode)")
+    if response_cache is not None:
+        print(f"Caching GET {', '.join(sorted(response_cache.routes))} for {response_cache.ttl_seconds:g}s "
+              f"({response_cache.max_bytes / 1024 / 1024:g} MiB budget)")
     
     # Create server
-    with socketserver.TCPServer(("", port), TransactionAPIHandler) as httpd:
+    with http.server.ThreadingHTTPServer(("", port), TransactionAPIHandler) as httpd:
+        threading.Thread(target=prepare_data, args=(data_file, lazy_cache_size, archive, hot_partitions),
+                         name='prepare-data', daemon=True).start()
         print(f"Server running on http://localhost:{port}")
-        print(f"Loaded {len(TransactionAPIHandler.transactions_list)} transactions")
+        print(f"Loading {data_file or TransactionAPIHandler.DATA_FILE} in the background "
+              f"(progress at GET /health)")
         print("\nValid credentials:")
         for username, password in TransactionAPIHandler.VALID_CREDENTIALS.items():
             print(f"  Username: {username}, Password: {password}")
@@ -353,16 +1600,117 @@ def start_server(port: int = 8000):
         print(f"\nAvailable endpoints:")
         print(f"  GET    /transactions       - List all transactions")
         print(f"  GET    /transactions/{{id}}  - Get specific transaction")
+        print(f"  GET    /transactions/analytics - Aggregates (requires NumPy)")
+        print(f"  GET    /transactions/export - Streamed NDJSON/CSV export")
+        print(f"  GET    /transactions/stream - Server-Sent Events change feed")
+        print(f"  GET    /transactions/search?q= - Full-text search")
         print(f"  POST   /transactions       - Create new transaction")
+        print(f"  POST   /transactions/import - Streamed XML/NDJSON import")
         print(f"  PUT    /transactions/{{id}}  - Update transaction")
+        print(f"  PATCH  /transactions/{{id}}  - Partially update transaction")
         print(f"  DELETE /transactions/{{id}}  - Delete transaction")
+        print(f"  GET    /alerts             - Velocity rule alerts")
+        print(f"  GET    /metrics            - Prometheus request metrics")
+        print(f"  GET    /health             - Readiness and load progress (no auth)")
+        print(f"  GET    /health/live        - Liveness (no auth)")
+        if profiler is not None:
+            print(f"  GET    /admin/profile      - Request profiles (admin only)")
+        if archive is not None:
+            print(f"  POST   /admin/archive      - Archive cold partitions (admin only)")
         print(f"\nPress Ctrl+C to stop the server")
         
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
             print("\nShutting down server...")
+        finally:
+            TransactionAPIHandler.access_log.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options for the server."""
+    arg_parser = argparse.ArgumentParser(description='SMS Transaction REST API Server')
+    arg_parser.add_argument('--port', type=int, default=8000, help='port to listen on')
+    arg_parser.add_argument('--data', default=TransactionAPIHandler.DATA_FILE,
+                            help='sms_transactions XML file to load at startup')
+    arg_parser.add_argument('--lazy', action='store_true',
+                            help='index record offsets at startup and parse records on first access')
+    arg_parser.add_argument('--cache-size', type=int, default=10000,
+                            help='records kept in the LRU cache in --lazy mode (default: 10000)')
+    arg_parser.add_argument('--archive-dir',
+                            help='spill all but the most recent partitions to segment files here')
+    arg_parser.add_argument('--partition', choices=list(GRANULARITIES), default='month',
+                            help='time partition granularity for --archive-dir (default: month)')
+    arg_parser.add_argument('--hot-partitions', type=int, default=2,
+                            help='most recent partitions kept in memory (default: 2)')
+    arg_parser.add_argument('--keep-alive-timeout', type=float, default=TransactionAPIHandler.timeout,
+                            help='seconds an idle persistent connection is kept open (default: 15)')
+    arg_parser.add_argument('--max-keepalive-requests', type=int,
+                            default=TransactionAPIHandler.MAX_KEEPALIVE_REQUESTS,
+                            help='requests served per connection before it is closed (default: 1000)')
+    arg_parser.add_argument('--stream-buffer', type=int, default=1024,
+                            help='change events kept for Last-Event-ID resumption (default: 1024)')
+    arg_parser.add_argument('--velocity-rule', action='append', type=parse_rule, dest='velocity_rules',
+                            metavar='NAME:SECONDS:LIMIT[:ACTION]',
+                            help='per-sender rule replacing the defaults, e.g. burst:300:count=10 or '
+                                 'large:3600:amount=1000000:hold (repeatable)')
+    arg_parser.add_argument('--no-velocity', action='store_true',
+                            help='disable velocity rules on POST /transactions')
+    arg_parser.add_argument('--response-cache', action='store_true',
+                            help='cache whole GET responses in memory for a short TTL')
+    arg_parser.add_argument('--response-cache-route', action='append', dest='response_cache_routes',
+                            metavar='TEMPLATE',
+                            help='route template to cache, e.g. /transactions (repeatable; implies '
+                                 f"--response-cache; default: {', '.join(CACHE_ROUTES)})")
+    arg_parser.add_argument('--response-cache-ttl', type=float, default=2.0,
+                            help='seconds a cached response is served (default: 2)')
+    arg_parser.add_argument('--response-cache-max-bytes', type=int, default=64 * 1024 * 1024,
+                            help='memory budget of the response cache (default: 64 MiB)')
+    arg_parser.add_argument('--profile', action='store_true',
+                            help='profile a sample of requests, dumpable at /admin/profile')
+    arg_parser.add_argument('--profile-rate', type=float, default=0.01,
+                            help='fraction of requests to profile (default: 0.01)')
+    arg_parser.add_argument('--profile-mode', choices=RequestProfiler.MODES, default='cprofile',
+                            help='cprofile (pstats output) or sampler (collapsed stacks)')
+    arg_parser.add_argument('--access-log', default='-',
+                            help="JSON access log file, or '-' for stderr (default)")
+    arg_parser.add_argument('--access-log-sample', type=float, default=1.0,
+                            help='fraction of non-error requests to log (default: 1.0)')
+    arg_parser.add_argument('--access-log-max-bytes', type=int, default=10 * 1024 * 1024,
+                            help='rotate the access log after this many bytes')
+    arg_parser.add_argument('--access-log-backups', type=int, default=5,
+                            help='number of rotated access log files to keep')
+    args = arg_parser.parse_args(argv)
+    
+    cacheable = {route.label for route in TransactionAPIHandler.ROUTER.routes
+                 if route.method == 'GET' and route.label not in TransactionAPIHandler.UNCACHEABLE_ROUTES}
+    for template in args.response_cache_routes or ():
+        if template not in cacheable:
+            arg_parser.error(f"--response-cache-route {template}: expected one of {', '.join(sorted(cacheable))}")
+    return args
 
 
 if __name__ == "__main__":
-    start_server()
\ No newline at end of file
+    args = parse_args()
+    TransactionAPIHandler.timeout = args.keep_alive_timeout
+    TransactionAPIHandler.MAX_KEEPALIVE_REQUESTS = args.max_keepalive_requests
+    TransactionAPIHandler.change_feed = ChangeFeed(args.stream_buffer)
+    TransactionAPIHandler.velocity = None if args.no_velocity else VelocityMonitor(args.velocity_rules or DEFAULT_RULES)
+    request_profiler = None
+    if args.profile:
+        request_profiler = RequestProfiler(args.profile_rate, args.profile_mode)
+    access_log_writer = AccessLogWriter(args.access_log, args.access_log_sample,
+                                        args.access_log_max_bytes, args.access_log_backups)
+    partition_archive = None
+    if args.archive_dir:
+        try:
+            partition_archive = PartitionArchive(args.archive_dir, args.partition)
+        except ValueError as e:
+            sys.exit(f"Error opening archive: {e}")
+    response_cache = None
+    if args.response_cache or args.response_cache_routes:
+        response_cache = ResponseCache(args.response_cache_routes or CACHE_ROUTES,
+                                       args.response_cache_ttl, args.response_cache_max_bytes)
+    start_server(args.port, request_profiler, access_log_writer, args.data,
+                 args.cache_size if args.lazy else None, partition_archive, args.hot_partitions,
+                 response_cache)
@@ -0,0 +1,483 @@
+"""
+Transaction Store Module
+Copy-on-write (MVCC-style) storage for transactions. Every commit publishes a
+new immutable snapshot with a single reference assignment, so readers never
+take a lock and never observe a half-applied write, and writers never wait
+for long-running readers such as listing or export responses. Containers are
+a frozen base plus a small overlay, so a commit copies O(changes) rather than
+O(records).
+"""
+
+import itertools
+import math
+import threading
+from collections.abc import Mapping, MutableMapping
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Marks a key of the base mapping as deleted in a LayeredMapping overlay
+_DELETED = object()
+
+# Smallest overlay folded into an in-memory base; larger bases compact at
+# sqrt(len(base)) entries, balancing the per-commit overlay copy against the
+# O(records) rebuild
+COMPACT_MIN_OVERLAY = 1024
+
+
+class LayeredMapping(MutableMapping):
+    """
+    Mutable view over a read-only base mapping.
+
+    Writes go to a small overlay dict (deletions of base keys are recorded as
+    tombstones), so copying the mapping for a new snapshot costs O(changes)
+    rather than O(records). The base is an in-memory dict, or a read-only
+    source (a lazily loaded TransactionFileIndex or a PartitionArchive) under
+    a LayeredMapping whose overlay is the dict layer that compaction folds
+    into; a file or archive itself is never rewritten.
+    """
+
+    def __init__(self, base: Mapping, overlay: Optional[dict] = None, size: Optional[int] = None):
+        self.base = base
+        self.overlay = overlay if overlay is not None else {}
+        self._size = len(base) if size is None else size
+
+    def copy(self) -> 'LayeredMapping':
+        return LayeredMapping(self.base, dict(self.overlay), self._size)
+
+    def compacted(self) -> 'LayeredMapping':
+        """
+        Fold a large overlay into the dict layer beneath it.
+
+        Over a dict, the overlay is merged into a new dict base (O(records)).
+        Over a read-only source, it is merged into the dict layer above that
+        source, which is created by the first compaction (O(records kept in
+        memory)). Returns self while the overlay is still small.
+        """
+        base = self.base
+        if type(base) is dict:
+            layer_size = len(base)
+        elif isinstance(base, LayeredMapping):
+            layer_size = len(base.overlay)
+        else:
+            layer_size = 0
+        if len(self.overlay) < max(COMPACT_MIN_OVERLAY, math.isqrt(layer_size)):
+            return self
+
+        if type(base) is dict:
+            merged = base.copy()
+            for key, value in self.overlay.items():
+                if value is _DELETED:
+                    del merged[key]
+                else:
+                    merged[key] = value
+            return LayeredMapping(merged)
+        if isinstance(base, LayeredMapping):
+            source, merged = base.base, base.overlay.copy()
+            for key, value in self.overlay.items():
+                if value is _DELETED and key not in source:
+                    del merged[key]
+                else:
+                    merged[key] = value
+        else:
+            source, merged = base, dict(self.overlay)
+        return LayeredMapping(LayeredMapping(source, merged, self._size))
+
+    def changes_over(self, source: Mapping) -> Optional[dict]:
+        """
+        Every layer above `source` merged into one dict (tombstones kept).
+
+        Returns None if `source` is not the bottom of this mapping.
+        """
+        base = self.base
+        if base is source:
+            merged = {}
+        elif isinstance(base, LayeredMapping):
+            merged = base.changes_over(source)
+            if merged is None:
+                return None
+        else:
+            return None
+        for key, value in self.overlay.items():
+            if value is _DELETED and key not in source:
+                merged.pop(key, None)
+            else:
+                merged[key] = value
+        return merged
+
+    def get(self, key, default=None):
+        value = self.overlay.get(key, self)
+        if value is self:
+            return self.base.get(key, default)
+        if value is _DELETED:
+            return default
+        return value
+
+    def __getitem__(self, key):
+        value = self.overlay.get(key, self)
+        if value is self:
+            return self.base[key]
+        if value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key) -> bool:
+        value = self.overlay.get(key, self)
+        if value is self:
+            return key in self.base
+        return value is not _DELETED
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._size += 1
+        self.overlay[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in self.base:
+            self.overlay[key] = _DELETED
+        else:
+            del self.overlay[key]
+        self._size -= 1
+
+    def __iter__(self) -> Iterator:
+        for key in self.base:
+            if self.overlay.get(key, self) is not _DELETED:
+                yield key
+        for key, value in self.overlay.items():
+            if value is not _DELETED and key not in self.base:
+                yield key
+
+    def __len__(self) -> int:
+        return self._size
+
+    def items(self) -> Iterator:
+        """(key, value) in base order, then added keys."""
+        if not self.overlay:
+            return iter(self.base.items())
+        return self._merge_items(self.base.items())
+
+    def values(self) -> Iterator:
+        """Values in base order, then added keys; streams base values when it can."""
+        if not self.overlay:
+            return iter(self.base.values())
+        return self._merge(self.base.items())
+
+    def items_between(self, since: Optional[float], until: Optional[float]) -> Optional[Iterator]:
+        """items() with the bottom source pruned to [since, until], or None if it cannot prune."""
+        base_items = self._base_items_between(since, until)
+        return None if base_items is None else self._merge_items(base_items)
+
+    def values_between(self, since: Optional[float], until: Optional[float]) -> Iterator:
+        """
+        values() with the base pruned to [since, until] when it supports it.
+
+        Pruning is coarse (whole partitions); callers still filter each record.
+        """
+        base_items = self._base_items_between(since, until)
+        return self.values() if base_items is None else self._merge(base_items)
+
+    def _base_items_between(self, since: Optional[float], until: Optional[float]) -> Optional[Iterator]:
+        if not hasattr(self.base, 'items_between'):
+            return None
+        return self.base.items_between(since, until)
+
+    def _merge(self, base_items) -> Iterator:
+        overlay = self.overlay
+        # overlay.get(key, base_value) substitutes overlaid values at C speed
+        merged = itertools.starmap(overlay.get, base_items)
+        if _DELETED in overlay.values():
+            merged = (value for value in merged if value is not _DELETED)
+        added = (value for key, value in overlay.items()
+                 if value is not _DELETED and key not in self.base)
+        return itertools.chain(merged, added)
+
+    def _merge_items(self, base_items) -> Iterator:
+        overlay = self.overlay
+        merged = ((key, overlay.get(key, value)) for key, value in base_items)
+        if _DELETED in overlay.values():
+            merged = ((key, value) for key, value in merged if value is not _DELETED)
+        added = ((key, value) for key, value in overlay.items()
+                 if value is not _DELETED and key not in self.base)
+        return itertools.chain(merged, added)
+
+
+class StoreSnapshot:
+    """
+    One published version of the store.
+
+    Snapshots and the records they contain are never modified after being
+    published; a reader holding a snapshot sees a consistent view for as long
+    as it keeps the reference.
+    """
+
+    __slots__ = ('by_id', 'by_reference', 'versions', 'version')
+
+    def __init__(self, by_id: LayeredMapping, by_reference: LayeredMapping,
+                 versions: LayeredMapping, version: int):
+        self.by_id = by_id                # id -> transaction (insertion ordered)
+        self.by_reference = by_reference  # reference -> id
+        self.versions = versions          # id -> record version (absent means 1)
+        self.version = version            # bumped on every commit
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.by_id.values())
+
+    def scan(self, since: Optional[float] = None, until: Optional[float] = None
+             ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate transactions, skipping archived partitions outside [since, until].
+
+        Records are not filtered individually; bounds are epoch seconds.
+        """
+        if (since is not None or until is not None) and hasattr(self.by_id, 'values_between'):
+            return self.by_id.values_between(since, until)
+        return iter(self)
+
+    def __contains__(self, transaction_id: int) -> bool:
+        return transaction_id in self.by_id
+
+    def get(self, transaction_id: int) -> Optional[Dict[str, Any]]:
+        """Return a transaction by ID, or None."""
+        return self.by_id.get(transaction_id)
+
+    def find_reference(self, reference: str) -> Optional[int]:
+        """Return the ID of the transaction with this reference, or None."""
+        return self.by_reference.get(reference)
+
+    def record_version(self, transaction_id: int) -> int:
+        """
+        Return the version of a record (used as its ETag).
+
+        Records loaded at startup are at version 1; every write sets the
+        version from the store-wide commit counter, so an ID that is deleted
+        and inserted again never repeats a version a client may still hold.
+        """
+        return self.versions.get(transaction_id, 1)
+
+    @property
+    def transactions(self) -> List[Dict[str, Any]]:
+        """All transactions as a list, in insertion order."""
+        return list(self.by_id.values())
+
+
+class WriteBatch(StoreSnapshot):
+    """
+    Draft of the next snapshot.
+
+    Containers are shared with the base snapshot until first written, then
+    copied once (only their overlay), so a commit that only updates records
+    never copies the reference index. Records are replaced rather than mutated. Every change
+    is also recorded in `changes` as (kind, record) for commit listeners.
+    """
+
+    __slots__ = ('next_id', 'changes', '_owned')
+
+    def __init__(self, base: StoreSnapshot, next_id: int):
+        super().__init__(base.by_id, base.by_reference, base.versions, base.version + 1)
+        self.next_id = next_id
+        self.changes: List[Tuple[str, Dict[str, Any]]] = []
+        self._owned = set()
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._owned)
+
+    @property
+    def write_version(self) -> int:
+        """Version of records written by this batch: above any version issued so far."""
+        return self.version + 1
+
+    def _own(self, name: str) -> LayeredMapping:
+        """Copy a container on its first write in this batch."""
+        if name not in self._owned:
+            setattr(self, name, getattr(self, name).copy())
+            self._owned.add(name)
+        return getattr(self, name)
+
+    def insert(self, transaction: Dict[str, Any]) -> Dict[str, Any]:
+        """Add a new transaction, assigning the next ID when it has none."""
+        if transaction['id'] is None:
+            transaction['id'] = self.next_id
+        self._own('by_id')[transaction['id']] = transaction
+        self._own('by_reference')[transaction['reference']] = transaction['id']
+        self._own('versions')[transaction['id']] = self.write_version
+        self.next_id = max(self.next_id, transaction['id'] + 1)
+        self.changes.append(('insert', transaction))
+        return transaction
+
+    def replace(self, transaction_id: int, transaction: Dict[str, Any]):
+        """Swap in a new copy of a record and bump its version."""
+        old_reference = self.by_id[transaction_id]['reference']
+        self._own('by_id')[transaction_id] = transaction
+        if transaction['reference'] != old_reference:
+            by_reference = self._own('by_reference')
+            if by_reference.get(old_reference) == transaction_id:
+                del by_reference[old_reference]
+            by_reference[transaction['reference']] = transaction_id
+        self._own('versions')[transaction_id] = self.write_version
+        self.changes.append(('replace', transaction))
+
+    def remove(self, transaction_id: int) -> Dict[str, Any]:
+        """Remove a transaction and return it (KeyError if absent)."""
+        transaction = self._own('by_id').pop(transaction_id)
+        if self.by_reference.get(transaction['reference']) == transaction_id:
+            del self._own('by_reference')[transaction['reference']]
+        if transaction_id in self.versions:
+            del self._own('versions')[transaction_id]
+        self.changes.append(('remove', transaction))
+        return transaction
+
+    def freeze(self) -> StoreSnapshot:
+        """Return the immutable snapshot to publish, compacting overgrown overlays."""
+        return StoreSnapshot(self.by_id.compacted(), self.by_reference.compacted(),
+                             self.versions.compacted(), self.version)
+
+
+class SnapshotStore:
+    """Holds the current snapshot; writers serialize, readers never block."""
+
+    def __init__(self, transactions: Iterable[Dict[str, Any]] = ()):
+        by_id = {t['id']: t for t in transactions}
+        self.snapshot = StoreSnapshot(LayeredMapping(by_id),
+                                      LayeredMapping({t['reference']: t['id'] for t in by_id.values()}),
+                                      LayeredMapping({}), 0)
+        self.next_id = max(by_id, default=0) + 1
+        self.index = None  # TransactionFileIndex when loaded lazily
+        # Called with WriteBatch.changes after each publishing commit, under the write lock
+        self.listeners: List[Callable[[List[Tuple[str, Dict[str, Any]]]], None]] = []
+        self._write_lock = threading.Lock()
+        # Serializes archive_partitions; while one is writing segments,
+        # _archiving collects the IDs that commits change
+        self._archive_lock = threading.Lock()
+        self._archiving: Optional[set] = None
+
+    @classmethod
+    def from_index(cls, index) -> 'SnapshotStore':
+        """
+        Build a store over a lazily loaded TransactionFileIndex.
+
+        Records stay on disk until first read; writes are kept in overlays,
+        which compaction folds into a dict layer above the index.
+        """
+        store = cls()
+        store.snapshot = StoreSnapshot(LayeredMapping(index), LayeredMapping(index.references),
+                                       LayeredMapping({}), 0)
+        store.next_id = max(index, default=0) + 1
+        store.index = index
+        return store
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
+
+    def add_listener(self, listener: Callable[[List[Tuple[str, Dict[str, Any]]]], None]
+                     ) -> StoreSnapshot:
+        """
+        Register a commit listener.
+
+        Returns:
+            StoreSnapshot: The snapshot the listener's first notification follows,
+            for listeners that build state from the existing records
+        """
+        with self._write_lock:
+            self.listeners.append(listener)
+            return self.snapshot
+
+    def archive_partitions(self, archive, keep: int = 2) -> int:
+        """
+        Move every record outside the newest `keep` partitions into an archive.
+
+        The first call spills from the in-memory records; later calls only
+        merge what changed since (new, updated and deleted records) into the
+        affected segments. Records without a usable timestamp stay in memory.
+        Segments are written without holding the write lock; records that
+        commits changed in the meantime keep their latest version in memory.
+
+        Args:
+            archive (PartitionArchive): Destination for cold partitions
+            keep (int): Number of most recent partitions kept in memory
+
+        Returns:
+            int: Number of records moved out of memory
+        """
+        with self._archive_lock:
+            with self._write_lock:
+                by_id = self.snapshot.by_id
+                pending = by_id.changes_over(archive) if isinstance(by_id, LayeredMapping) else None
+                if pending is None:
+                    pending = {t['id']: t for t in by_id.values()}
+
+                keys = {archive.partition_key(t) for t in pending.values() if t is not _DELETED}
+                keys.discard(None)
+                keys.update(archive.partitions)
+                ordered = sorted(keys)
+                cold = set(ordered[:len(ordered) - keep] if keep > 0 else ordered)
+
+                updates: Dict[str, Dict[int, Optional[Dict[str, Any]]]] = {}
+                hot = {}
+                moved = 0
+                for transaction_id, transaction in pending.items():
+                    if transaction is _DELETED:
+                        key = archive.partition_of(transaction_id)
+                        if key is not None:
+                            updates.setdefault(key, {})[transaction_id] = None
+                        continue
+                    key = archive.partition_key(transaction)
+                    if key in cold:
+                        updates.setdefault(key, {})[transaction_id] = transaction
+                        moved += 1
+                    else:
+                        hot[transaction_id] = transaction
+
+                if not updates:
+                    return 0
+                self._archiving = set()
+
+            try:
+                partitions, _ = archive.stage_partitions(updates)
+            except BaseException:
+                with self._write_lock:
+                    self._archiving = None
+                raise
+
+            staged = {transaction_id: transaction is not None
+                      for changes in updates.values() for transaction_id, transaction in changes.items()}
+            with self._write_lock:
+                touched, self._archiving = self._archiving, None
+                snapshot = self.snapshot
+                for transaction_id in touched:
+                    transaction = snapshot.by_id.get(transaction_id)
+                    if transaction is not None:
+                        hot[transaction_id] = transaction
+                    elif staged.get(transaction_id, transaction_id in archive):
+                        hot[transaction_id] = _DELETED
+                    else:
+                        hot.pop(transaction_id, None)
+                archive.publish_partitions(partitions)
+                self.snapshot = StoreSnapshot(LayeredMapping(LayeredMapping(archive, hot, len(snapshot.by_id))),
+                                              snapshot.by_reference, snapshot.versions,
+                                              snapshot.version + 1)
+                return moved
+
+    @contextmanager
+    def write(self) -> Iterator[WriteBatch]:
+        """
+        Open a write transaction on top of the latest snapshot.
+
+        The batch is published atomically when the block exits normally; if the
+        block raises, nothing is published. Listeners then see the changes in
+        commit order.
+        """
+        with self._write_lock:
+            batch = WriteBatch(self.snapshot, self.next_id)
+            yield batch
+            if batch.dirty:
+                self.next_id = batch.next_id
+                self.snapshot = batch.freeze()
+                if self._archiving is not None:
+                    self._archiving.update(transaction['id'] for _, transaction in batch.changes)
+                for listener in self.listeners:
+                    listener(batch.changes)
@@ -0,0 +1,192 @@
+"""
+Velocity Rules Module
+Streaming fraud checks evaluated on every new transaction. Each sender has a
+sliding window per rule, kept as a ring of fixed-width time buckets holding
+the count and amount of transactions, plus running totals. Recording a
+transaction touches one bucket and expires at most the buckets that went
+stale since the sender's previous transaction, so a check is O(1) whatever
+the history or number of senders.
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# What happens to a transaction that breaks a rule
+ACTIONS = ('flag', 'hold')
+
+
+class SlidingWindow:
+    """Count and sum of amounts over the last window_seconds, in time buckets."""
+
+    __slots__ = ('bucket_seconds', 'counts', 'sums', 'count', 'total', 'last_bucket')
+
+    def __init__(self, window_seconds: float, buckets: int = 60):
+        self.bucket_seconds = window_seconds / buckets
+        self.counts = [0] * buckets
+        self.sums = [0.0] * buckets
+        self.count = 0
+        self.total = 0.0
+        self.last_bucket = 0
+
+    def add(self, amount: float, now: float) -> Tuple[int, float]:
+        """
+        Record an amount at time now (seconds) and return the window's (count, sum).
+
+        Times are expected to be non-decreasing; an earlier time is counted in
+        the current bucket.
+        """
+        bucket = int(now // self.bucket_seconds)
+        size = len(self.counts)
+        if bucket > self.last_bucket:
+            # Expire buckets that left the window since the previous call
+            for stale in range(max(self.last_bucket + 1, bucket - size + 1), bucket + 1):
+                slot = stale % size
+                self.count -= self.counts[slot]
+                self.total -= self.sums[slot]
+                self.counts[slot] = 0
+                self.sums[slot] = 0.0
+            self.last_bucket = bucket
+        slot = self.last_bucket % size
+        self.counts[slot] += 1
+        self.sums[slot] += amount
+        self.count += 1
+        self.total += amount
+        return self.count, self.total
+
+
+class VelocityRule:
+    """Threshold on a sender's transaction count and/or amount within a window."""
+
+    def __init__(self, name: str, window_seconds: float, max_count: Optional[int] = None,
+                 max_amount: Optional[float] = None, action: str = 'flag'):
+        """
+        Args:
+            name (str): Rule identifier reported in alerts
+            window_seconds (float): Length of the sliding window
+            max_count (int): Most transactions allowed in the window
+            max_amount (float): Largest total amount allowed in the window
+            action (str): 'flag' (record an alert) or 'hold' (also create the
+                transaction with status HELD)
+        """
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown rule action: {action}")
+        if max_count is None and max_amount is None:
+            raise ValueError(f"Rule {name} needs max_count or max_amount")
+        self.name = name
+        self.window_seconds = window_seconds
+        self.max_count = max_count
+        self.max_amount = max_amount
+        self.action = action
+
+    def breached(self, count: int, total: float) -> bool:
+        return ((self.max_count is not None and count > self.max_count) or
+                (self.max_amount is not None and total > self.max_amount))
+
+
+def parse_rule(spec: str) -> VelocityRule:
+    """
+    Parse a rule from NAME:WINDOW_SECONDS:LIMIT[,LIMIT][:ACTION].
+
+    LIMIT is count=N or amount=X, e.g. "burst:300:count=10" or
+    "large:3600:amount=1000000:hold".
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    parts = spec.split(':')
+    if len(parts) not in (3, 4):
+        raise ValueError(f"Invalid velocity rule: {spec}")
+    limits = {}
+    for limit in parts[2].split(','):
+        key, _, value = limit.partition('=')
+        if key not in ('count', 'amount') or not value:
+            raise ValueError(f"Invalid velocity rule limit: {limit}")
+        limits[key] = int(value) if key == 'count' else float(value)
+    return VelocityRule(parts[0], float(parts[1]), limits.get('count'), limits.get('amount'),
+                        parts[3] if len(parts) == 4 else 'flag')
+
+
+DEFAULT_RULES = (
+    VelocityRule('sender_count_5m', 5 * 60, max_count=10),
+    VelocityRule('sender_amount_1h', 60 * 60, max_amount=1_000_000.0, action='hold'),
+)
+
+
+class VelocityMonitor:
+    """Per-sender sliding windows for a set of rules, plus a bounded alert log."""
+
+    def __init__(self, rules: Sequence[VelocityRule] = DEFAULT_RULES,
+                 max_senders: int = 100000, max_alerts: int = 1000):
+        """
+        Args:
+            rules: Rules evaluated for every transaction
+            max_senders (int): Senders tracked at once; the least recently active are dropped
+            max_alerts (int): Most recent alerts kept for GET /alerts
+        """
+        self.rules = tuple(rules)
+        self.max_senders = max_senders
+        self.alerts: 'deque[Dict[str, Any]]' = deque(maxlen=max_alerts)
+        self._windows: 'OrderedDict[str, List[SlidingWindow]]' = OrderedDict()
+        self._alert_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def check(self, sender: str, amount: float, now: Optional[float] = None
+              ) -> List[Dict[str, Any]]:
+        """
+        Record a transaction and return the rules it breaks.
+
+        Returns:
+            List[Dict]: One entry per breached rule with the window's count and sum
+        """
+        now = time.time() if now is None else now
+        hits = []
+        with self._lock:
+            windows = self._windows.get(sender)
+            if windows is None:
+                windows = self._windows[sender] = [SlidingWindow(rule.window_seconds) for rule in self.rules]
+                if len(self._windows) > self.max_senders:
+                    self._windows.popitem(last=False)
+            else:
+                self._windows.move_to_end(sender)
+            for rule, window in zip(self.rules, windows):
+                count, total = window.add(amount, now)
+                if rule.breached(count, total):
+                    hits.append({
+                        'rule': rule.name,
+                        'action': rule.action,
+                        'window_seconds': rule.window_seconds,
+                        'count': count,
+                        'amount': round(total, 2),
+                        'max_count': rule.max_count,
+                        'max_amount': rule.max_amount
+                    })
+        return hits
+
+    def record(self, hits: List[Dict[str, Any]], transaction: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Turn rule hits for a stored transaction into alerts in the alert log."""
+        alerts = []
+        with self._lock:
+            for hit in hits:
+                alert = {
+                    'id': next(self._alert_ids),
+                    'transaction_id': transaction['id'],
+                    'reference': transaction['reference'],
+                    'sender': transaction['sender'],
+                    'created_at': time.time(),
+                    **hit
+                }
+                self.alerts.append(alert)
+                alerts.append(alert)
+        return alerts
+
+    def recent_alerts(self, sender: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Newest alerts first, optionally for one sender."""
+        with self._lock:
+            alerts = list(self.alerts)
+        alerts.reverse()
+        if sender is not None:
+            alerts = [alert for alert in alerts if alert['sender'] == sender]
+        return alerts[:limit]
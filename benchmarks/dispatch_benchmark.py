@@ -0,0 +1,141 @@
+"""
+Dispatch Benchmark
+Measures per-request routing overhead in-process: the precompiled route table
+in api/router.py against the previous urlparse + split + if-chain dispatch,
+and how each scales as more routes are registered.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.parse
+from typing import Callable, Dict, List
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+from router import Router  # noqa: E402
+
+
+# Request targets in roughly the proportions seen by the load test
+TARGETS = [
+    ('GET', '/transactions/17'),
+    ('GET', '/transactions/17?fields=id,amount'),
+    ('GET', '/transactions?status=completed&type=deposit'),
+    ('POST', '/transactions'),
+    ('PATCH', '/transactions/17'),
+    ('GET', '/metrics'),
+    ('GET', '/does/not/exist'),
+]
+
+ROUTES = [
+    ('GET', '/transactions', 'handle_list'),
+    ('GET', '/transactions/export', 'handle_export'),
+    ('GET', '/transactions/analytics', 'handle_analytics'),
+    ('GET', '/transactions/{id:int}', 'handle_get'),
+    ('POST', '/transactions', 'handle_create'),
+    ('POST', '/transactions/import', 'handle_import'),
+    ('PUT', '/transactions/{id:int}', 'handle_update'),
+    ('PATCH', '/transactions/{id:int}', 'handle_update'),
+    ('DELETE', '/transactions/{id:int}', 'handle_delete'),
+    ('GET', '/metrics', 'handle_metrics'),
+    ('GET', '/admin/profile', 'handle_profile_dump', {'admin': True}),
+    ('POST', '/admin/archive', 'handle_archive', {'admin': True}),
+]
+
+
+def extra_routes(count: int) -> List[tuple]:
+    """Dummy static and parameterized routes placed ahead of the real ones."""
+    routes = []
+    for i in range(count):
+        if i % 2:
+            routes.append(('GET', f'/extra{i}/{{id:int}}', 'handle_get'))
+        else:
+            routes.append(('GET', f'/extra{i}', 'handle_list'))
+    return routes
+
+
+def if_chain_dispatcher(routes: List[tuple]) -> Callable[[str, str], tuple]:
+    """
+    Emulate the previous dispatch: parse the URL and query string on every
+    request, split the path, then test each route's shape in turn.
+    """
+    def dispatch(method: str, target: str) -> tuple:
+        parsed_url = urllib.parse.urlparse(target)
+        path_parts = [p for p in parsed_url.path.split('/') if p]
+        query_params = urllib.parse.parse_qs(parsed_url.query)
+        for route_method, template, handler, *_ in routes:
+            if route_method != method:
+                continue
+            template_parts = [p for p in template.split('/') if p]
+            if len(template_parts) != len(path_parts):
+                continue
+            params = {}
+            for part, template_part in zip(path_parts, template_parts):
+                if template_part.startswith('{'):
+                    try:
+                        params['id'] = int(part)
+                    except ValueError:
+                        break
+                elif part != template_part:
+                    break
+            else:
+                return handler, params, query_params
+        return None, {}, query_params
+    return dispatch
+
+
+def router_dispatcher(routes: List[tuple]) -> Callable[[str, str], tuple]:
+    """Dispatch through the compiled Router (query string parsed lazily)."""
+    router = Router(routes)
+
+    def dispatch(method: str, target: str) -> tuple:
+        request = router.resolve(method, target)
+        return request.route, request.params, request
+    return dispatch
+
+
+def time_dispatch(dispatch: Callable[[str, str], tuple], iterations: int) -> float:
+    """Mean nanoseconds per dispatched request."""
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        for method, target in TARGETS:
+            dispatch(method, target)
+    return (time.perf_counter_ns() - start) / (iterations * len(TARGETS))
+
+
+def run(iterations: int, extra_counts: List[int]) -> Dict[str, Dict[str, float]]:
+    """Report ns/request for both dispatchers at each route table size."""
+    report = {}
+    for extra in extra_counts:
+        routes = extra_routes(extra) + ROUTES
+        if_chain = time_dispatch(if_chain_dispatcher(routes), iterations)
+        router = time_dispatch(router_dispatcher(routes), iterations)
+        report[str(len(routes))] = {
+            'if_chain_ns': round(if_chain, 1),
+            'router_ns': round(router, 1),
+            'speedup': round(if_chain / router, 2)
+        }
+    return report
+
+
+def main():
+    """Command line entry point."""
+    arg_parser = argparse.ArgumentParser(description='Benchmark request dispatch overhead')
+    arg_parser.add_argument('--iterations', type=int, default=20000)
+    arg_parser.add_argument('--extra-routes', default='0,50,200',
+                            help='comma-separated numbers of dummy routes to register')
+    arg_parser.add_argument('--output', help='write the JSON report to this file')
+    args = arg_parser.parse_args()
+
+    report = run(args.iterations, [int(n) for n in args.extra_routes.split(',')])
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
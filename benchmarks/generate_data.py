@@ -0,0 +1,63 @@
+"""
+Synthetic Data Generator
+Writes sms_transactions XML files of arbitrary size for benchmarking.
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta
+
+
+TRANSACTION_TYPES = ['SEND_MONEY', 'RECEIVE_MONEY', 'WITHDRAW', 'DEPOSIT', 'BILL_PAYMENT']
+TRANSACTION_STATUSES = ['COMPLETED', 'COMPLETED', 'COMPLETED', 'PENDING', 'FAILED']
+
+
+def generate_xml(output_file: str, count: int, seed: int = 42, senders: int = 10000):
+    """
+    Stream `count` synthetic transactions to an sms_transactions XML file.
+    
+    Args:
+        output_file (str): Destination path
+        count (int): Number of <transaction> elements to write
+        seed (int): Random seed so runs are reproducible
+        senders (int): Size of the phone number pool
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    phones = [f"+250{rng.randrange(10**8, 10**9)}" for _ in range(senders)]
+    agents = [f"AGENT_{i:03d}" for i in range(1, 200)]
+    
+    with open(output_file, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<sms_transactions>\n')
+        for transaction_id in range(1, count + 1):
+            transaction_type = rng.choice(TRANSACTION_TYPES)
+            receiver = rng.choice(agents) if transaction_type == 'WITHDRAW' else rng.choice(phones)
+            timestamp = start + timedelta(seconds=transaction_id * 30 + rng.randrange(30))
+            f.write(
+                f'    <transaction id="{transaction_id}">\n'
+                f'        <type>{transaction_type}</type>\n'
+                f'        <amount>{rng.randrange(100, 500000) / 100:.2f}</amount>\n'
+                f'        <sender>{rng.choice(phones)}</sender>\n'
+                f'        <receiver>{receiver}</receiver>\n'
+                f'        <timestamp>{timestamp.isoformat()}Z</timestamp>\n'
+                f'        <reference>TXN{transaction_id:08d}</reference>\n'
+                f'        <status>{rng.choice(TRANSACTION_STATUSES)}</status>\n'
+                f'    </transaction>\n'
+            )
+        f.write('</sms_transactions>\n')
+
+
+def main():
+    """Command line entry point."""
+    arg_parser = argparse.ArgumentParser(description='Generate synthetic sms_transactions XML')
+    arg_parser.add_argument('output', help='XML file to write')
+    arg_parser.add_argument('--count', type=int, default=10000, help='number of transactions')
+    arg_parser.add_argument('--seed', type=int, default=42, help='random seed')
+    args = arg_parser.parse_args()
+    
+    generate_xml(args.output, args.count, args.seed)
+    print(f"Wrote {args.count} transactions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Load Generator
+Drives the REST API with concurrent workers over persistent http.client
+connections and reports throughput and latency percentiles per endpoint.
+"""
+
+import argparse
+import base64
+import http.client
+import json
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+# Scenario name -> default weight in the request mix
+DEFAULT_MIX = {'get': 70, 'list': 5, 'create': 25}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse 'get=70,list=5,create=25' into a weight mapping."""
+    weights = {}
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown scenario in mix: {name}")
+        weights[name] = int(weight)
+    return weights
+
+
+class LoadGenerator:
+    """Concurrent keep-alive load generator for the transaction API."""
+
+    def __init__(self, host: str = 'localhost', port: int = 8000,
+                 username: str = 'admin', password: str = 'password123',
+                 max_id: int = 20, mix: Optional[Dict[str, int]] = None, seed: int = 1):
+        self.host = host
+        self.port = port
+        self.max_id = max_id
+        self.mix = mix or dict(DEFAULT_MIX)
+        self.seed = seed
+        credentials = base64.b64encode(f"{username}:{password}".encode()).decode("ascii")
+        self.headers = {
+            "Authorization": f"Basic {credentials}",
+            "Content-Type": "application/json"
+        }
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = {}
+        self._errors: Dict[str, int] = {}
+        self._reconnects = 0
+
+    def _next_request(self, rng: random.Random) -> Tuple[str, str, str, Optional[bytes]]:
+        """Pick a scenario from the mix and build (endpoint, method, path, body)."""
+        scenario = rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        if scenario == 'get':
+            return 'GET /transactions/{id}', 'GET', f"/transactions/{rng.randint(1, self.max_id)}", None
+        if scenario == 'list':
+            status = rng.choice(['PENDING', 'FAILED'])
+            return 'GET /transactions?status', 'GET', f"/transactions?status={status}", None
+        body = json.dumps({
+            'type': 'SEND_MONEY',
+            'amount': rng.randrange(100, 100000) / 100,
+            'sender': f"+250{rng.randrange(10**8, 10**9)}",
+            'receiver': f"+250{rng.randrange(10**8, 10**9)}",
+            'reference': f"BENCH{rng.randrange(10**12)}"
+        }).encode('utf-8')
+        return 'POST /transactions', 'POST', '/transactions', body
+
+    def _worker(self, worker_id: int, deadline: float, request_budget: Optional[int]):
+        """Issue requests on one persistent connection until the deadline/budget."""
+        rng = random.Random(self.seed * 1000 + worker_id)
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        latencies: Dict[str, List[float]] = {}
+        errors: Dict[str, int] = {}
+        reconnects = 0
+        sent = 0
+
+        while time.perf_counter() < deadline and (request_budget is None or sent < request_budget):
+            endpoint, method, path, body = self._next_request(rng)
+            start = time.perf_counter()
+            try:
+                connection.request(method, path, body=body, headers=self.headers)
+                response = connection.getresponse()
+                response.read()
+                elapsed = time.perf_counter() - start
+                if response.status >= 400 and response.status != 404:
+                    errors[endpoint] = errors.get(endpoint, 0) + 1
+                else:
+                    latencies.setdefault(endpoint, []).append(elapsed)
+                if response.will_close:
+                    reconnects += 1
+            except (http.client.HTTPException, OSError):
+                errors[endpoint] = errors.get(endpoint, 0) + 1
+                connection.close()
+                reconnects += 1
+            sent += 1
+        connection.close()
+
+        with self._lock:
+            for endpoint, values in latencies.items():
+                self._latencies.setdefault(endpoint, []).extend(values)
+            for endpoint, count in errors.items():
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + count
+            self._reconnects += reconnects
+
+    def run(self, concurrency: int = 8, duration: float = 10.0,
+            requests_per_worker: Optional[int] = None) -> Dict:
+        """
+        Run the load test and return a JSON-serializable report.
+
+        Args:
+            concurrency (int): Number of concurrent connections
+            duration (float): Maximum run time in seconds
+            requests_per_worker (int): Optional request budget per connection
+        """
+        self._latencies.clear()
+        self._errors.clear()
+        self._reconnects = 0
+
+        start = time.perf_counter()
+        deadline = start + duration
+        workers = [threading.Thread(target=self._worker, args=(i, deadline, requests_per_worker))
+                   for i in range(concurrency)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        wall_time = time.perf_counter() - start
+
+        endpoints = {}
+        all_latencies = []
+        for endpoint in sorted(set(self._latencies) | set(self._errors)):
+            values = sorted(self._latencies.get(endpoint, []))
+            all_latencies.extend(values)
+            endpoints[endpoint] = self._summarize(values, self._errors.get(endpoint, 0), wall_time)
+        all_latencies.sort()
+
+        return {
+            'config': {
+                'host': self.host,
+                'port': self.port,
+                'concurrency': concurrency,
+                'duration_s': round(wall_time, 3),
+                'mix': self.mix
+            },
+            'total': self._summarize(all_latencies, sum(self._errors.values()), wall_time),
+            'endpoints': endpoints,
+            'reconnects': self._reconnects
+        }
+
+    @staticmethod
+    def _summarize(sorted_latencies: List[float], errors: int, wall_time: float) -> Dict:
+        """Throughput and latency percentiles (milliseconds) for one endpoint."""
+        return {
+            'requests': len(sorted_latencies),
+            'errors': errors,
+            'throughput_rps': round(len(sorted_latencies) / wall_time, 2) if wall_time > 0 else 0.0,
+            'p50_ms': round(percentile(sorted_latencies, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(sorted_latencies, 0.95) * 1000, 3),
+            'p99_ms': round(percentile(sorted_latencies, 0.99) * 1000, 3),
+            'max_ms': round(sorted_latencies[-1] * 1000, 3) if sorted_latencies else 0.0
+        }
+
+
+def compare_reports(baseline: Dict, current: Dict) -> Dict[str, Dict[str, float]]:
+    """Percentage change of throughput and p99 per endpoint versus a baseline report."""
+    changes = {}
+    for endpoint, stats in current['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(endpoint)
+        if not previous:
+            continue
+        changes[endpoint] = {
+            metric: round((stats[metric] - previous[metric]) / previous[metric] * 100, 1)
+            for metric in ('throughput_rps', 'p50_ms', 'p99_ms') if previous[metric]
+        }
+    return changes
+
+
+def main():
+    """Command line entry point."""
+    arg_parser = argparse.ArgumentParser(description='Load test the SMS Transaction API')
+    arg_parser.add_argument('--host', default='localhost')
+    arg_parser.add_argument('--port', type=int, default=8000)
+    arg_parser.add_argument('--concurrency', type=int, default=8)
+    arg_parser.add_argument('--duration', type=float, default=10.0, help='seconds to run')
+    arg_parser.add_argument('--max-id', type=int, default=20, help='highest existing transaction id')
+    arg_parser.add_argument('--mix', default='get=70,list=5,create=25',
+                            help='scenario weights, e.g. get=70,list=5,create=25')
+    arg_parser.add_argument('--output', help='write the JSON report to this file')
+    arg_parser.add_argument('--baseline', help='previous JSON report to compare against')
+    args = arg_parser.parse_args()
+
+    generator = LoadGenerator(args.host, args.port, max_id=args.max_id, mix=parse_mix(args.mix))
+    report = generator.run(args.concurrency, args.duration)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            report['change_vs_baseline_pct'] = compare_reports(json.load(f), report)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
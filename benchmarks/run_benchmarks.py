@@ -0,0 +1,130 @@
+"""
+Benchmark Suite
+Generates synthetic datasets at several sizes, starts the API server against
+each one and records a load test report per size as JSON.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from generate_data import generate_xml
+from load_test import LoadGenerator, compare_reports, parse_mix
+
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'api', 'server.py')
+
+
+def wait_for_port(port: int, timeout: float) -> bool:
+    """Poll until the server accepts connections."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('localhost', port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def wait_until_ready(port: int, timeout: float) -> bool:
+    """Poll GET /health until the server has finished loading its data."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection('localhost', port, timeout=5)
+            connection.request('GET', '/health')
+            response = connection.getresponse()
+            response.read()
+            connection.close()
+            if response.status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.05)
+    return False
+
+
+def run_size(size: int, args: argparse.Namespace, work_dir: str) -> Dict:
+    """Generate a dataset of `size` rows, serve it and load test it."""
+    data_file = os.path.join(work_dir, f"sms_{size}.xml")
+    generate_start = time.perf_counter()
+    generate_xml(data_file, size)
+    generate_time = time.perf_counter() - generate_start
+
+    server = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT, '--port', str(args.port), '--data', data_file,
+         '--access-log', os.path.join(work_dir, 'access.log')],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        startup_start = time.perf_counter()
+        if not wait_for_port(args.port, args.startup_timeout):
+            raise RuntimeError(f"Server did not start within {args.startup_timeout}s for size {size}")
+        listen_time = time.perf_counter() - startup_start
+        if not wait_until_ready(args.port, args.startup_timeout):
+            raise RuntimeError(f"Server did not load its data within {args.startup_timeout}s for size {size}")
+        startup_time = time.perf_counter() - startup_start
+
+        generator = LoadGenerator(port=args.port, max_id=size, mix=parse_mix(args.mix))
+        report = generator.run(args.concurrency, args.duration)
+    finally:
+        server.terminate()
+        server.wait()
+        os.remove(data_file)
+
+    report['dataset'] = {
+        'rows': size,
+        'generate_s': round(generate_time, 3),
+        'listen_s': round(listen_time, 3),
+        'startup_s': round(startup_time, 3)
+    }
+    return report
+
+
+def main():
+    """Command line entry point."""
+    arg_parser = argparse.ArgumentParser(description='Run the API benchmark suite')
+    arg_parser.add_argument('--sizes', default='10000,100000',
+                            help='comma separated dataset sizes (10k - 10M rows)')
+    arg_parser.add_argument('--port', type=int, default=8765)
+    arg_parser.add_argument('--concurrency', type=int, default=8)
+    arg_parser.add_argument('--duration', type=float, default=10.0)
+    arg_parser.add_argument('--mix', default='get=70,list=5,create=25')
+    arg_parser.add_argument('--startup-timeout', type=float, default=600.0)
+    arg_parser.add_argument('--output', default='benchmark_results.json')
+    arg_parser.add_argument('--baseline', help='previous results file to compare against')
+    args = arg_parser.parse_args()
+
+    sizes: List[int] = [int(size) for size in args.sizes.split(',')]
+    results = {'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'runs': {}}
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in sizes:
+            print(f"Benchmarking {size:,} transactions...")
+            report = run_size(size, args, work_dir)
+            results['runs'][str(size)] = report
+            total = report['total']
+            print(f"  {total['throughput_rps']} req/s, p50 {total['p50_ms']} ms, "
+                  f"p99 {total['p99_ms']} ms, startup {report['dataset']['startup_s']} s")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        for size, report in results['runs'].items():
+            if size in baseline.get('runs', {}):
+                report['change_vs_baseline_pct'] = compare_reports(baseline['runs'][size], report)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
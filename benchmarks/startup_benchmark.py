@@ -0,0 +1,111 @@
+"""
+Startup Benchmark
+Measures cold start of `python api/server.py`: the import time of the server
+module, the time until GET /health first answers (the socket is bound) and the
+time until it reports ready (the data file is loaded), for several dataset
+sizes.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from generate_data import generate_xml
+
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+SERVER_SCRIPT = os.path.join(API_DIR, 'server.py')
+
+
+def import_time(repeats: int) -> float:
+    """Median milliseconds to import the server module in a fresh interpreter."""
+    code = ("import time; start = time.perf_counter(); import server; "
+            "print((time.perf_counter() - start) * 1000)")
+    samples = [float(subprocess.run([sys.executable, '-c', code], cwd=API_DIR, check=True,
+                                    capture_output=True, text=True).stdout)
+               for _ in range(repeats)]
+    return statistics.median(samples)
+
+
+def health_status(port: int) -> Optional[int]:
+    """Status code of GET /health, or None while nothing is listening."""
+    try:
+        connection = http.client.HTTPConnection('localhost', port, timeout=5)
+        connection.request('GET', '/health')
+        response = connection.getresponse()
+        response.read()
+        connection.close()
+        return response.status
+    except OSError:
+        return None
+
+
+def cold_start(data_file: str, port: int, extra_args: List[str], timeout: float) -> Dict[str, float]:
+    """Start the server once and time its first /health answer and readiness."""
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT, '--port', str(port), '--data', data_file,
+         '--access-log', os.devnull, *extra_args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        listen_ms = None
+        while time.perf_counter() - start < timeout:
+            status = health_status(port)
+            if status is not None and listen_ms is None:
+                listen_ms = (time.perf_counter() - start) * 1000
+            if status == 200:
+                return {'listen_ms': round(listen_ms, 1),
+                        'ready_ms': round((time.perf_counter() - start) * 1000, 1)}
+            time.sleep(0.005)
+        raise RuntimeError(f"Server was not ready within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def run(sizes: List[int], repeats: int, port: int, lazy: bool, timeout: float) -> Dict:
+    """Report median cold-start timings per dataset size."""
+    report = {'import_ms': round(import_time(repeats), 1), 'sizes': {}}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in sizes:
+            data_file = os.path.join(work_dir, f"sms_{size}.xml")
+            generate_xml(data_file, size)
+            runs = [cold_start(data_file, port, ['--lazy'] if lazy else [], timeout)
+                    for _ in range(repeats)]
+            report['sizes'][str(size)] = {
+                key: statistics.median(run[key] for run in runs) for key in ('listen_ms', 'ready_ms')
+            }
+    return report
+
+
+def main():
+    """Command line entry point."""
+    arg_parser = argparse.ArgumentParser(description='Benchmark API server cold start')
+    arg_parser.add_argument('--sizes', default='1000,100000',
+                            help='comma separated dataset sizes')
+    arg_parser.add_argument('--repeats', type=int, default=5)
+    arg_parser.add_argument('--port', type=int, default=8766)
+    arg_parser.add_argument('--lazy', action='store_true', help='start the server with --lazy')
+    arg_parser.add_argument('--timeout', type=float, default=600.0)
+    arg_parser.add_argument('--output', help='write the JSON report to this file')
+    args = arg_parser.parse_args()
+
+    report = run([int(n) for n in args.sizes.split(',')], args.repeats, args.port,
+                 args.lazy, args.timeout)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Transaction Analytics Module
+Materializes parsed transactions into NumPy column arrays and answers
+aggregate queries (group-by sums, histograms, time-bucketed volumes) with
+vectorized operations instead of Python loops over dictionaries.
+
+NumPy is optional: NUMPY_AVAILABLE is False when it is not installed.
+"""
+
+import threading
+import warnings
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+# Categorical columns encoded as integer codes
+CATEGORICAL_FIELDS = ('type', 'status', 'sender', 'receiver')
+
+# Bucket name -> bucket width in seconds (month is handled by datetime64 units)
+TIME_BUCKETS = {'hour': 3600, 'day': 86400, 'week': 7 * 86400, 'month': None}
+
+# Queued changes after which the commit listener applies them itself (when no
+# report is running), so the queue stays bounded between analytics requests
+MAX_PENDING_CHANGES = 10000
+
+
+def _parse_epoch(timestamp: Optional[str]) -> int:
+    """Parse a single ISO 8601 timestamp to epoch seconds (-1 if unparseable)."""
+    if not timestamp:
+        return -1
+    try:
+        return int(datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp())
+    except ValueError:
+        return -1
+
+
+def _grown(array: 'np.ndarray', capacity: int) -> 'np.ndarray':
+    """Copy of a 1-D array with room for `capacity` elements."""
+    grown = np.empty(capacity, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def _epoch_seconds(timestamps: List[Optional[str]]) -> 'np.ndarray':
+    """Convert ISO 8601 strings to int64 epoch seconds, vectorized when possible."""
+    try:
+        with warnings.catch_warnings():
+            # Explicit offsets are applied by NumPy but trigger a deprecation warning
+            warnings.simplefilter('ignore')
+            stripped = np.array([t[:-1] if t and t.endswith('Z') else t for t in timestamps],
+                                dtype='datetime64[us]')
+        return stripped.astype('datetime64[s]').astype(np.int64)
+    except (ValueError, TypeError):
+        # Mixed offsets or malformed values: fall back to per-row parsing
+        return np.fromiter((_parse_epoch(t) for t in timestamps), dtype=np.int64,
+                           count=len(timestamps))
+
+
+class TransactionColumns:
+    """
+    Columnar (struct-of-arrays) representation of a transaction list.
+
+    apply() keeps the columns current with store commits: inserted rows are
+    appended into spare capacity and replaced rows are patched in place, so a
+    commit costs O(changes) instead of a rebuild. Removed rows stay allocated
+    and are excluded from every query by the live mask.
+    """
+
+    def __init__(self, transactions: List[Dict[str, Any]]):
+        if np is None:
+            raise RuntimeError("NumPy is required for analytics (pip install numpy)")
+
+        count = len(transactions)
+        self.count = count
+        self._ids = np.fromiter((t['id'] for t in transactions), dtype=np.int64, count=count)
+        self._amounts = np.fromiter((t['amount'] for t in transactions), dtype=np.float64, count=count)
+        self._timestamps = _epoch_seconds([t.get('timestamp') for t in transactions])
+        self._live = np.ones(count, dtype=bool)
+        self._row_of: Dict[int, int] = {id_: row for row, id_ in enumerate(self._ids.tolist())}
+
+        # field -> category values (code -> value), value -> code, int codes array
+        self.categories: Dict[str, List[str]] = {}
+        self._code_of: Dict[str, Dict[str, int]] = {}
+        self._codes: Dict[str, 'np.ndarray'] = {}
+        for field in CATEGORICAL_FIELDS:
+            values = np.array([str(t.get(field)) for t in transactions], dtype=object)
+            categories, codes = np.unique(values, return_inverse=True) if count else (
+                np.array([], dtype=object), np.array([], dtype=np.int64))
+            self.categories[field] = categories.tolist()
+            self._code_of[field] = {value: code for code, value in enumerate(self.categories[field])}
+            self._codes[field] = codes.astype(np.int64)
+        self._publish()
+
+    def _publish(self):
+        """Expose the first `count` rows of each buffer as the queried columns."""
+        count = self.count
+        self.ids = self._ids[:count]
+        self.amounts = self._amounts[:count]
+        self.timestamps = self._timestamps[:count]
+        self.live = self._live[:count]
+        self.codes = {field: codes[:count] for field, codes in self._codes.items()}
+
+    @classmethod
+    def from_parser(cls, parser) -> 'TransactionColumns':
+        """Build columns from a TransactionParser, parsing the XML if needed."""
+        transactions = parser.transactions_list or parser.parse_xml_to_json()
+        return cls(transactions)
+
+    def apply(self, changes: Iterable[Tuple[str, Dict[str, Any]]]):
+        """Apply store commit (kind, transaction) changes to the columns."""
+        for kind, transaction in changes:
+            row = self._row_of.get(transaction['id'])
+            if kind == 'remove':
+                if row is not None:
+                    self._live[row] = False
+                continue
+            if row is None:
+                row = self._append_row(transaction['id'])
+            self._amounts[row] = transaction['amount']
+            self._timestamps[row] = _epoch_seconds([transaction.get('timestamp')])[0]
+            self._live[row] = True
+            for field in CATEGORICAL_FIELDS:
+                self._codes[field][row] = self._code(field, str(transaction.get(field)))
+        self._publish()
+
+    def _append_row(self, transaction_id: int) -> int:
+        """Allocate the next row, doubling the buffers when they are full."""
+        row = self.count
+        if row == len(self._ids):
+            capacity = max(16, 2 * row)
+            self._ids = _grown(self._ids, capacity)
+            self._amounts = _grown(self._amounts, capacity)
+            self._timestamps = _grown(self._timestamps, capacity)
+            self._live = _grown(self._live, capacity)
+            self._codes = {field: _grown(codes, capacity) for field, codes in self._codes.items()}
+        self._ids[row] = transaction_id
+        self._row_of[transaction_id] = row
+        self.count = row + 1
+        return row
+
+    def _code(self, field: str, value: str) -> int:
+        """Code of a category value, adding the category if it is new."""
+        code = self._code_of[field].get(value)
+        if code is None:
+            code = len(self.categories[field])
+            self.categories[field].append(value)
+            self._code_of[field][value] = code
+        return code
+
+    def mask(self, **filters: Optional[str]) -> 'np.ndarray':
+        """Boolean row mask of live rows matching equality filters on categorical fields."""
+        selected = self.live.copy()
+        for field, value in filters.items():
+            if value is None:
+                continue
+            if field not in self.codes:
+                raise ValueError(f"Cannot filter on field: {field}")
+            code = self._code_of[field].get(value)
+            if code is None:
+                return np.zeros(self.count, dtype=bool)
+            selected &= self.codes[field] == code
+        return selected
+
+    def summary(self, selected: 'np.ndarray') -> Dict[str, Any]:
+        """Count, total, mean, min and max amount for the selected rows."""
+        amounts = self.amounts[selected]
+        if amounts.size == 0:
+            return {'count': 0, 'total_amount': 0.0, 'mean_amount': 0.0,
+                    'min_amount': 0.0, 'max_amount': 0.0}
+        return {
+            'count': int(amounts.size),
+            'total_amount': round(float(amounts.sum()), 2),
+            'mean_amount': round(float(amounts.mean()), 2),
+            'min_amount': float(amounts.min()),
+            'max_amount': float(amounts.max())
+        }
+
+    def group_sum(self, field: str, selected: 'np.ndarray', limit: Optional[int] = None
+                  ) -> List[Dict[str, Any]]:
+        """Count and sum of amount per category, largest totals first."""
+        if field not in self.codes:
+            raise ValueError(f"Cannot group by field: {field}")
+        categories = self.categories[field]
+        codes = self.codes[field][selected]
+        counts = np.bincount(codes, minlength=len(categories))
+        sums = np.bincount(codes, weights=self.amounts[selected], minlength=len(categories))
+
+        order = np.argsort(-sums, kind='stable')
+        order = order[counts[order] > 0]
+        if limit is not None:
+            order = order[:limit]
+        return [{field: str(categories[i]), 'count': int(counts[i]),
+                 'total_amount': round(float(sums[i]), 2)} for i in order]
+
+    def amount_histogram(self, selected: 'np.ndarray', bins: int = 10) -> Dict[str, List]:
+        """Histogram of amounts with equal-width bins."""
+        amounts = self.amounts[selected]
+        if amounts.size == 0:
+            return {'edges': [], 'counts': []}
+        counts, edges = np.histogram(amounts, bins=bins)
+        return {'edges': [round(float(edge), 2) for edge in edges],
+                'counts': counts.tolist()}
+
+    def volume_over_time(self, selected: 'np.ndarray', bucket: str = 'day') -> List[Dict[str, Any]]:
+        """Transaction count and amount per time bucket, in chronological order."""
+        if bucket not in TIME_BUCKETS:
+            raise ValueError(f"Unknown time bucket: {bucket}")
+        valid = selected & (self.timestamps >= 0)
+        timestamps = self.timestamps[valid]
+        if timestamps.size == 0:
+            return []
+
+        if bucket == 'month':
+            bucket_keys = timestamps.astype('datetime64[s]').astype('datetime64[M]').astype(np.int64)
+        else:
+            bucket_keys = timestamps // TIME_BUCKETS[bucket]
+        keys, inverse = np.unique(bucket_keys, return_inverse=True)
+        counts = np.bincount(inverse)
+        sums = np.bincount(inverse, weights=self.amounts[valid])
+
+        if bucket == 'month':
+            starts = keys.astype('datetime64[M]').astype('datetime64[s]')
+        else:
+            starts = (keys * TIME_BUCKETS[bucket]).astype('datetime64[s]')
+        return [{'bucket_start': f"{start}Z", 'count': int(count), 'total_amount': round(float(total), 2)}
+                for start, count, total in zip(starts, counts, sums)]
+
+    def report(self, group_by: str = 'type', bucket: str = 'day', bins: int = 10,
+               limit: Optional[int] = 20, **filters: Optional[str]) -> Dict[str, Any]:
+        """Full analytics report used by GET /transactions/analytics."""
+        selected = self.mask(**filters)
+        return {
+            'filters': {field: value for field, value in filters.items() if value is not None},
+            'summary': self.summary(selected),
+            'group_by': {'field': group_by, 'groups': self.group_sum(group_by, selected, limit)},
+            'amount_histogram': self.amount_histogram(selected, bins),
+            'volume': {'bucket': bucket, 'series': self.volume_over_time(selected, bucket)}
+        }
+
+
+class LiveColumns:
+    """
+    TransactionColumns kept current with a SnapshotStore's commits.
+
+    The commit listener only queues changes; they are applied before the next
+    report under a lock that also serializes reports, so a report never sees
+    a half-applied commit and concurrent requests never rebuild in parallel.
+    """
+
+    def __init__(self, store):
+        self._lock = threading.Lock()          # columns: catch-up and reports
+        self._pending_lock = threading.Lock()  # queued changes
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        with self._lock:
+            snapshot = store.add_listener(self._enqueue)
+            # Built outside the store's write lock; commits meanwhile are queued
+            self.columns = TransactionColumns(snapshot.transactions)
+
+    def _enqueue(self, changes: List[Tuple[str, Dict[str, Any]]]):
+        """Commit listener (called under the store's write lock)."""
+        with self._pending_lock:
+            self._pending.extend(changes)
+            backlog = len(self._pending)
+        if backlog >= MAX_PENDING_CHANGES and self._lock.acquire(blocking=False):
+            try:
+                self._catch_up()
+            finally:
+                self._lock.release()
+
+    def _catch_up(self):
+        """Apply queued changes (caller holds the lock)."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            self.columns.apply(pending)
+
+    def report(self, *args, **kwargs) -> Dict[str, Any]:
+        """TransactionColumns.report() over the latest committed data."""
+        with self._lock:
+            self._catch_up()
+            return self.columns.report(*args, **kwargs)
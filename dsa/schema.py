@@ -0,0 +1,237 @@
+"""
+Transaction Schema Module
+Declarative field rules for transaction records. A Schema compiles its rules
+once into generated Python functions with every check inlined, so validating
+a record is a single call with no per-field dispatch. The same compiled
+schema validates records parsed from XML files, JSON request bodies and bulk
+imports, so every entry point accepts and normalizes data the same way.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+TRANSACTION_TYPES = ('SEND_MONEY', 'RECEIVE_MONEY', 'WITHDRAW', 'DEPOSIT', 'BILL_PAYMENT')
+TRANSACTION_STATUSES = ('PENDING', 'COMPLETED', 'FAILED', 'HELD')
+
+# Largest amount accepted for a single transaction
+MAX_AMOUNT = 10_000_000.0
+
+
+class ValidationError(ValueError):
+    """A field is missing or does not satisfy its rule."""
+
+    def __init__(self, field: str, message: str):
+        super().__init__(message)
+        self.field = field
+
+
+def utc_now() -> str:
+    """Current time as an ISO 8601 UTC timestamp (default for new records)."""
+    return datetime.utcnow().isoformat() + 'Z'
+
+
+class Field:
+    """Rule for one field: type, optional normalization and constraints."""
+
+    def __init__(self, kind: type, required: bool = True, default: Any = None,
+                 choices: Optional[Iterable[str]] = None, upper: bool = False,
+                 minimum: Optional[float] = None, maximum: Optional[float] = None,
+                 max_length: Optional[int] = None, timestamp: bool = False):
+        """
+        Args:
+            kind (type): int, float or str
+            required (bool): Whether a full record must provide the field
+            default: Value, or zero-argument callable, used when an optional field is absent
+            choices (Iterable[str]): Allowed values (after normalization)
+            upper (bool): Upper-case string values before checking choices
+            minimum (float): Lower bound, inclusive for int and exclusive for float
+            maximum (float): Inclusive upper bound
+            max_length (int): Longest allowed string
+            timestamp (bool): Require a string datetime.fromisoformat accepts ("Z" allowed)
+        """
+        if kind not in (int, float, str):
+            raise ValueError(f"Unsupported field type: {kind!r}")
+        self.kind = kind
+        self.required = required
+        self.default = default
+        self.choices = frozenset(choices) if choices is not None else None
+        self.upper = upper
+        self.minimum = minimum
+        self.maximum = maximum
+        self.max_length = max_length
+        self.timestamp = timestamp
+
+    def source(self, name: str, var: str, namespace: Dict[str, Any]) -> List[str]:
+        """
+        Python statements that check and normalize the value held in `var`.
+
+        Constants the statements need (choice sets, bounds, messages) are
+        added to namespace under names prefixed with var.
+        """
+        def fail(message: str) -> str:
+            namespace[f'{var}_{len(namespace)}'] = message
+            return f"raise ValidationError({name!r}, {var}_{len(namespace) - 1})"
+
+        lines = []
+        if self.kind is int:
+            lines += [f"if {var}.__class__ is not int:",
+                      f"    if {var}.__class__ is not str:",
+                      f"        {fail(f'Invalid {name}: expected an integer')}",
+                      f"    try:",
+                      f"        {var} = int({var})",
+                      f"    except ValueError:",
+                      f"        {fail(f'Invalid {name}: expected an integer')}"]
+        elif self.kind is float:
+            lines += [f"if {var}.__class__ is not float:",
+                      f"    if {var}.__class__ is not int and {var}.__class__ is not str:",
+                      f"        {fail(f'Invalid {name}: expected a number')}",
+                      f"    try:",
+                      f"        {var} = float({var})",
+                      f"    except ValueError:",
+                      f"        {fail(f'Invalid {name}: expected a number')}"]
+        else:
+            lines += [f"if {var}.__class__ is not str:",
+                      f"    {fail(f'Invalid {name}: expected a string')}",
+                      f"{var} = {var}.strip()",
+                      f"if not {var}:",
+                      f"    {fail(f'Invalid {name}: must not be empty')}"]
+            if self.upper:
+                lines.append(f"{var} = {var}.upper()")
+            if self.choices is not None:
+                namespace[f'{var}_choices'] = self.choices
+                allowed = ', '.join(sorted(self.choices))
+                lines += [f"if {var} not in {var}_choices:",
+                          f"    {fail(f'Invalid {name}: must be one of {allowed}')}"]
+            if self.max_length is not None:
+                lines += [f"if len({var}) > {self.max_length}:",
+                          f"    {fail(f'Invalid {name}: longer than {self.max_length} characters')}"]
+            if self.timestamp:
+                lines += [f"try:",
+                          f"    parse_datetime({var}.replace('Z', '+00:00'))",
+                          f"except ValueError:",
+                          f"    {fail(f'Invalid {name}: expected an ISO 8601 date-time')}"]
+
+        if self.kind is not str:
+            # Written as "not (in range)" so that NaN fails for floats
+            strict = self.kind is float
+            bounds, limits = [], []
+            if self.minimum is not None:
+                bounds.append(f"{var} {'>' if strict else '>='} {self.minimum!r}")
+                limits.append(f"{'greater than' if strict else 'at least'} {self.minimum:.15g}")
+            elif strict:
+                bounds.append(f"{var} != -INFINITY")
+            if self.maximum is not None:
+                bounds.append(f"{var} <= {self.maximum!r}")
+                limits.append(f"at most {self.maximum:.15g}")
+            elif strict:
+                bounds.append(f"{var} != INFINITY")
+            if bounds:
+                message = f"must be {' and '.join(limits)}" if limits else "must be finite"
+                lines += [f"if not ({' and '.join(bounds)}):",
+                          f"    {fail(f'Invalid {name}: {message}')}"]
+        return lines
+
+
+class Schema:
+    """Field rules compiled into generated validation functions."""
+
+    def __init__(self, fields: Dict[str, Field]):
+        self.fields = fields
+        # exclude tuple as passed by callers -> generated validator
+        self._validators: Dict[tuple, Callable[[Any], Dict[str, Any]]] = {}
+        self._field_validators = {name: self._compile_field(name, rule) for name, rule in fields.items()}
+        self._validators[()] = self._compile(frozenset())
+
+    def validate(self, data: Dict[str, Any], exclude: Tuple[str, ...] = ()) -> Dict[str, Any]:
+        """
+        Validate and normalize a full record.
+
+        Missing optional fields get their default; fields not in the schema
+        are dropped.
+
+        Args:
+            data (Dict): Raw record, e.g. a JSON body or XML element fields
+            exclude (Tuple[str]): Schema fields not taken from data but set to None
+                (e.g. a server-assigned id); one validator is generated per tuple
+
+        Returns:
+            Dict: Normalized record in schema field order
+
+        Raises:
+            ValidationError: On the first missing or invalid field
+        """
+        validator = self._validators.get(exclude)
+        if validator is None:
+            validator = self._validators[exclude] = self._compile(frozenset(exclude))
+        return validator(data)
+
+    def validate_partial(self, data: Dict[str, Any], allowed: Iterable[str]) -> Dict[str, Any]:
+        """
+        Validate only the allowed fields present in data (for updates).
+
+        Raises:
+            ValidationError: If a present field is invalid
+        """
+        if data.__class__ is not dict:
+            raise ValidationError('', 'Invalid record: expected an object')
+        validators = self._field_validators
+        return {name: validators[name](data[name]) for name in allowed if name in data}
+
+    def _compile(self, exclude: FrozenSet[str]) -> Callable[[Any], Dict[str, Any]]:
+        """Generate the full-record validator; excluded fields are set to None."""
+        namespace = self._namespace()
+        body = ["if data.__class__ is not dict:",
+                "    raise ValidationError('', 'Invalid record: expected an object')",
+                "get = data.get"]
+        result = []
+        for position, (name, rule) in enumerate(self.fields.items()):
+            var = f'f{position}'
+            if name in exclude:
+                result.append(f"{name!r}: None")
+                continue
+            body.append(f"{var} = get({name!r})")
+            if rule.required:
+                body += [f"if {var} is None:",
+                         f"    raise ValidationError({name!r}, {('Missing required field: ' + name)!r})"]
+                body += rule.source(name, var, namespace)
+            else:
+                namespace[f'{var}_default'] = rule.default
+                fallback = f"{var}_default()" if callable(rule.default) else f"{var}_default"
+                body += [f"if {var} is None:",
+                         f"    {var} = {fallback}",
+                         "else:"]
+                body += ['    ' + line for line in rule.source(name, var, namespace)]
+            result.append(f"{name!r}: {var}")
+        body.append(f"return {{{', '.join(result)}}}")
+        return self._build('validate', 'data', body, namespace)
+
+    def _compile_field(self, name: str, rule: Field) -> Callable[[Any], Any]:
+        """Generate the validator for a single present value of one field."""
+        namespace = self._namespace()
+        body = rule.source(name, 'value', namespace) + ["return value"]
+        return self._build(f'validate_{name}', 'value', body, namespace)
+
+    @staticmethod
+    def _namespace() -> Dict[str, Any]:
+        return {'ValidationError': ValidationError, 'parse_datetime': datetime.fromisoformat,
+                'INFINITY': float('inf')}
+
+    @staticmethod
+    def _build(function_name: str, argument: str, body: List[str],
+               namespace: Dict[str, Any]) -> Callable:
+        source = f"def {function_name}({argument}):\n" + ''.join(f"    {line}\n" for line in body)
+        exec(compile(source, f'<schema {function_name}>', 'exec'), namespace)
+        return namespace[function_name]
+
+
+TRANSACTION_SCHEMA = Schema({
+    'id': Field(int, minimum=1),
+    'type': Field(str, choices=TRANSACTION_TYPES, upper=True),
+    'amount': Field(float, minimum=0, maximum=MAX_AMOUNT),
+    'sender': Field(str, max_length=64),
+    'receiver': Field(str, max_length=64),
+    'timestamp': Field(str, required=False, default=utc_now, timestamp=True),
+    'reference': Field(str, max_length=128),
+    'status': Field(str, required=False, default='PENDING', choices=TRANSACTION_STATUSES, upper=True),
+})
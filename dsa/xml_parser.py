@@ -4,9 +4,91 @@ This module handles XML parsing and implements different search algorithms for c
 """
 
 import xml.etree.ElementTree as ET
+import bisect
+import csv
+import functools
+import io
 import json
+import mmap
+import re
 import time
-from typing import List, Dict, Optional, Any
+from collections.abc import Mapping
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple, Any
+
+from schema import TRANSACTION_SCHEMA, ValidationError
+# random, statistics and xml.sax are imported inside the lazy index and the
+# search benchmarks that use them, keeping them out of the API server's start-up
+
+
+# Bytes read per chunk when parsing a file
+READ_SIZE = 256 * 1024
+
+# Invalid records reported individually per file; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+# Column order used by CSV/NDJSON exports
+EXPORT_FIELDS = ['id', 'type', 'amount', 'sender', 'receiver', 'timestamp', 'reference', 'status']
+
+
+def iter_ndjson(transactions: Iterable[Dict[str, Any]], batch_size: int = 500) -> Iterator[str]:
+    """
+    Yield newline-delimited JSON in chunks of batch_size records.
+    
+    Args:
+        transactions (Iterable[Dict]): Records to serialize
+        batch_size (int): Records joined into each yielded chunk
+        
+    Yields:
+        str: One or more complete NDJSON lines
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    batch = []
+    for transaction in transactions:
+        batch.append(encode(transaction))
+        if len(batch) >= batch_size:
+            yield '\n'.join(batch) + '\n'
+            batch = []
+    if batch:
+        yield '\n'.join(batch) + '\n'
+
+
+def iter_csv(transactions: Iterable[Dict[str, Any]], fields: Optional[List[str]] = None,
+             batch_size: int = 500) -> Iterator[str]:
+    """
+    Yield CSV text (header first) in chunks of batch_size rows.
+    
+    Args:
+        transactions (Iterable[Dict]): Records to serialize
+        fields (List[str]): Columns to write, defaults to EXPORT_FIELDS
+        batch_size (int): Rows written into each yielded chunk
+        
+    Yields:
+        str: CSV text ending on a row boundary
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields or EXPORT_FIELDS,
+                            extrasaction='ignore', lineterminator='\n')
+    writer.writeheader()
+    rows = 0
+    for transaction in transactions:
+        writer.writerow(transaction)
+        rows += 1
+        if rows >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+class InvalidRecordError(Exception):
+    """Raised when a record read from a data file fails schema validation."""
+    
+    def __init__(self, transaction_id: int, error: ValidationError):
+        super().__init__(f"Invalid transaction {transaction_id} in data file: {error}")
+        self.transaction_id = transaction_id
+        self.error = error
 
 
 class TransactionParser:
@@ -16,55 +98,248 @@ class TransactionParser:
         self.xml_file_path = xml_file_path
         self.transactions_list = []
         self.transactions_dict = {}
+        self.skipped = 0  # invalid records left out by parse_xml_to_json
+        self.errors: List[Dict[str, Any]] = []  # the first MAX_REPORTED_ERRORS of them
     
-    def parse_xml_to_json(self) -> List[Dict[str, Any]]:
+    def parse_xml_to_json(self, progress: Optional[Callable[[int, int], None]] = None,
+                          raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Parse XML file and convert to list of dictionaries (JSON format).
         
+        The file is streamed through iter_parse_stream, so the element tree of
+        the whole document is never held in memory. Records that fail schema
+        validation are skipped, counted in `skipped` and logged.
+        
+        Args:
+            progress (Callable): Called as progress(bytes_read, records_parsed)
+                before each chunk of the file is parsed
+            raise_errors (bool): Raise when the file cannot be read or is not
+                well-formed XML, instead of printing the error and returning []
+        
         Returns:
             List[Dict]: List of transaction dictionaries
         """
         try:
-            tree = ET.parse(self.xml_file_path)
-            root = tree.getroot()
-            
             transactions = []
+            self.skipped = 0
+            self.errors = []
             
-            for transaction_elem in root.findall('transaction'):
-                transaction = {
-                    'id': int(transaction_elem.get('id')),
-                    'type': transaction_elem.find('type').text,
-                    'amount': float(transaction_elem.find('amount').text),
-                    'sender': transaction_elem.find('sender').text,
-                    'receiver': transaction_elem.find('receiver').text,
-                    'timestamp': transaction_elem.find('timestamp').text,
-                    'reference': transaction_elem.find('reference').text,
-                    'status': transaction_elem.find('status').text
-                }
-                transactions.append(transaction)
+            with open(self.xml_file_path, 'rb') as f:
+                def chunks():
+                    for chunk in iter(functools.partial(f.read, READ_SIZE), b''):
+                        if progress is not None:
+                            progress(f.tell(), len(transactions))
+                        yield chunk
+                
+                for record_number, fields in enumerate(self.iter_parse_stream(chunks(), validate=False), 1):
+                    try:
+                        transactions.append(TRANSACTION_SCHEMA.validate(fields))
+                    except ValidationError as e:
+                        self.skipped += 1
+                        if len(self.errors) < MAX_REPORTED_ERRORS:
+                            self.errors.append({'record': record_number, 'id': fields.get('id'),
+                                                'field': e.field, 'error': str(e)})
+                            print(f"Skipping invalid transaction (record {record_number}, "
+                                  f"id {fields.get('id')}): {e}")
             
+            if self.skipped:
+                print(f"Skipped {self.skipped} invalid transactions in {self.xml_file_path}")
             self.transactions_list = transactions
             self._build_dictionary()
             
             return transactions
             
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error parsing XML: {e}")
             return []
     
+    @staticmethod
+    def element_fields(transaction_elem: ET.Element) -> Dict[str, Any]:
+        """Raw text of a <transaction> element's id attribute and child fields."""
+        fields = {child.tag: child.text for child in transaction_elem}
+        fields['id'] = transaction_elem.get('id')
+        return fields
+    
+    @classmethod
+    def transaction_from_element(cls, transaction_elem: ET.Element) -> Dict[str, Any]:
+        """
+        Convert a <transaction> element into a validated transaction dictionary.
+        
+        Raises:
+            ValidationError: If a field is missing or violates TRANSACTION_SCHEMA
+        """
+        return TRANSACTION_SCHEMA.validate(cls.element_fields(transaction_elem))
+    
+    @classmethod
+    def iter_parse_stream(cls, chunks: Iterable[bytes], validate: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Incrementally parse sms_transactions XML from an iterable of byte chunks.
+        
+        Transactions are yielded as soon as their closing tag arrives and the
+        parsed elements are discarded, so memory use does not grow with input size.
+        
+        Args:
+            chunks (Iterable[bytes]): Raw XML data, e.g. read from a socket
+            validate (bool): Yield schema-validated records; when False, yield raw
+                element fields so the caller can validate and report per record
+            
+        Yields:
+            Dict: Transaction dictionaries in document order
+            
+        Raises:
+            ET.ParseError: If the XML is malformed
+        """
+        convert = cls.transaction_from_element if validate else cls.element_fields
+        pull_parser = ET.XMLPullParser(events=('start', 'end'))
+        root = None
+        chunks = iter(chunks)
+        while True:
+            chunk = next(chunks, None)
+            if chunk is None:
+                pull_parser.close()
+            else:
+                pull_parser.feed(chunk)
+            
+            for event, elem in pull_parser.read_events():
+                if root is None:
+                    root = elem
+                if event == 'end' and elem.tag == 'transaction':
+                    yield convert(elem)
+                    # Detach finished elements so the tree never grows
+                    elem.clear()
+                    if root is not elem:
+                        root.clear()
+            
+            if chunk is None:
+                return
+    
     def _build_dictionary(self):
         """Build dictionary for O(1) lookup by transaction ID."""
         self.transactions_dict = {transaction['id']: transaction 
                                 for transaction in self.transactions_list}
     
-    def save_to_json_file(self, output_file: str):
-        """Save parsed transactions to JSON file."""
+    def save_to_json_file(self, output_file: str, output_format: str = 'json'):
+        """
+        Save parsed transactions to a file.
+        
+        Args:
+            output_file (str): Destination path
+            output_format (str): 'json' (indented array), or the streaming
+                'ndjson' / 'csv' writers which never build the whole document in memory
+        """
+        writers = {'ndjson': iter_ndjson, 'csv': iter_csv}
+        if output_format != 'json' and output_format not in writers:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(self.transactions_list, f, indent=2, ensure_ascii=False)
+            newline = '' if output_format == 'csv' else None
+            with open(output_file, 'w', encoding='utf-8', newline=newline) as f:
+                if output_format == 'json':
+                    json.dump(self.transactions_list, f, indent=2, ensure_ascii=False)
+                else:
+                    for chunk in writers[output_format](self.transactions_list):
+                        f.write(chunk)
             print(f"Transactions saved to {output_file}")
         except Exception as e:
-            print(f"Error saving JSON: {e}")
+            print(f"Error saving {output_format.upper()}: {e}")
+
+
+class TransactionFileIndex(Mapping):
+    """
+    Read-only mapping of transaction ID to record, backed by an XML file.
+    
+    Opening the index only scans the file for the byte span of every
+    <transaction> element (and its reference); records are parsed on first
+    access and kept in a bounded LRU cache, so memory use depends on the hot
+    set rather than on the size of the archive.
+    
+    Records are only validated when parsed: reading an invalid one raises
+    InvalidRecordError, while items() and values() skip it and record it in
+    `invalid` (id -> error), logging each one the first time it is found.
+    """
+    
+    _TRANSACTION = re.compile(rb'<transaction\b[^>]*?\bid="(\d+)"[^>]*>.*?</transaction>', re.DOTALL)
+    _REFERENCE = re.compile(rb'<reference>(.*?)</reference>', re.DOTALL)
+    
+    def __init__(self, xml_file_path: str, cache_size: int = 10000,
+                 progress: Optional[Callable[[int, int], None]] = None):
+        """
+        Args:
+            xml_file_path (str): sms_transactions XML file
+            cache_size (int): Maximum number of parsed records kept in memory
+            progress (Callable): Called as progress(bytes_scanned, records_indexed)
+                every 1000 records while the file is scanned
+        """
+        from xml.sax.saxutils import unescape
+        
+        self.xml_file_path = xml_file_path
+        with open(xml_file_path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        self.offsets: Dict[int, Tuple[int, int]] = {}  # id -> (offset, length)
+        self.references: Dict[str, int] = {}           # reference -> id
+        self.invalid: Dict[int, str] = {}              # id -> validation error
+        for match in self._TRANSACTION.finditer(self._data):
+            transaction_id = int(match.group(1))
+            self.offsets[transaction_id] = (match.start(), match.end() - match.start())
+            reference = self._REFERENCE.search(match.group(0))
+            if reference:
+                self.references[unescape(reference.group(1).decode('utf-8'))] = transaction_id
+            if progress is not None and len(self.offsets) % 1000 == 0:
+                progress(match.end(), len(self.offsets))
+        
+        self._load = functools.lru_cache(maxsize=cache_size)(self._read_record)
+    
+    def _read_record(self, transaction_id: int) -> Dict[str, Any]:
+        """
+        Parse one record from its byte span.
+        
+        Raises:
+            InvalidRecordError: If the record fails schema validation
+        """
+        offset, length = self.offsets[transaction_id]
+        element = ET.fromstring(self._data[offset:offset + length])
+        try:
+            return TransactionParser.transaction_from_element(element)
+        except ValidationError as e:
+            if transaction_id not in self.invalid:
+                self.invalid[transaction_id] = str(e)
+                print(f"Invalid transaction {transaction_id} in {self.xml_file_path}: {e}")
+            raise InvalidRecordError(transaction_id, e) from e
+    
+    def __getitem__(self, transaction_id: int) -> Dict[str, Any]:
+        if transaction_id not in self.offsets:
+            raise KeyError(transaction_id)
+        return self._load(transaction_id)
+    
+    def __contains__(self, transaction_id: object) -> bool:
+        return transaction_id in self.offsets
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.offsets)
+    
+    def __len__(self) -> int:
+        return len(self.offsets)
+    
+    def items(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (id, record) in file order without filling the LRU cache, skipping invalid records."""
+        for transaction_id in self.offsets:
+            try:
+                transaction = self._read_record(transaction_id)
+            except InvalidRecordError:
+                continue
+            yield transaction_id, transaction
+    
+    def values(self) -> Iterator[Dict[str, Any]]:
+        """Yield records in file order without filling the LRU cache."""
+        for _, transaction in self.items():
+            yield transaction
+    
+    def cache_info(self):
+        """Hit/miss statistics of the record cache."""
+        return self._load.cache_info()
 
 
 class SearchAlgorithms:
@@ -73,6 +348,11 @@ class SearchAlgorithms:
     def __init__(self, transactions_list: List[Dict], transactions_dict: Dict):
         self.transactions_list = transactions_list
         self.transactions_dict = transactions_dict
+        
+        # Parallel arrays sorted by ID for binary search / bisect
+        ordered = sorted(transactions_list, key=lambda t: t['id'])
+        self.sorted_ids = [t['id'] for t in ordered]
+        self.sorted_transactions = ordered
     
     def linear_search(self, transaction_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -103,38 +383,179 @@ class SearchAlgorithms:
         """
         return self.transactions_dict.get(transaction_id)
     
-    def compare_search_efficiency(self, search_ids: List[int], iterations: int = 1000) -> Dict[str, float]:
+    def binary_search(self, transaction_id: int) -> Optional[Dict[str, Any]]:
         """
-        Compare efficiency of linear search vs dictionary lookup.
+        Hand-written binary search over the sorted ID array.
+        Time Complexity: O(log n)
         
         Args:
-            search_ids (List[int]): List of IDs to search for
-            iterations (int): Number of iterations for timing
+            transaction_id (int): ID of the transaction to find
             
         Returns:
-            Dict[str, float]: Timing results for both methods
+            Optional[Dict]: Transaction if found, None otherwise
         """
-        # Time linear search
-        start_time = time.time()
-        for _ in range(iterations):
-            for search_id in search_ids:
-                self.linear_search(search_id)
-        linear_time = time.time() - start_time
+        sorted_ids = self.sorted_ids
+        low, high = 0, len(sorted_ids) - 1
+        while low <= high:
+            mid = (low + high) // 2
+            mid_id = sorted_ids[mid]
+            if mid_id == transaction_id:
+                return self.sorted_transactions[mid]
+            if mid_id < transaction_id:
+                low = mid + 1
+            else:
+                high = mid - 1
+        return None
+    
+    def bisect_lookup(self, transaction_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Binary search using the C-implemented bisect module.
+        Time Complexity: O(log n)
+        
+        Args:
+            transaction_id (int): ID of the transaction to find
+            
+        Returns:
+            Optional[Dict]: Transaction if found, None otherwise
+        """
+        index = bisect.bisect_left(self.sorted_ids, transaction_id)
+        if index < len(self.sorted_ids) and self.sorted_ids[index] == transaction_id:
+            return self.sorted_transactions[index]
+        return None
+    
+    def search_methods(self) -> Dict[str, Callable[[int], Optional[Dict[str, Any]]]]:
+        """Return the built-in lookup methods keyed by name."""
+        return {
+            'linear_search': self.linear_search,
+            'dictionary_lookup': self.dictionary_lookup,
+            'binary_search': self.binary_search,
+            'bisect_lookup': self.bisect_lookup
+        }
+    
+    def build_search_ids(self, count: int, miss_rate: float = 0.0, seed: int = 42) -> List[int]:
+        """
+        Build a reproducible list of IDs to look up.
+        
+        Args:
+            count (int): Number of IDs
+            miss_rate (float): Fraction of IDs guaranteed not to exist
+            seed (int): Random seed
+            
+        Returns:
+            List[int]: Shuffled IDs mixing hits and misses
+        """
+        import random
+        
+        rng = random.Random(seed)
+        misses = int(round(count * miss_rate)) if self.sorted_ids else count
+        max_id = self.sorted_ids[-1] if self.sorted_ids else 0
+        hits = [rng.choice(self.sorted_ids) for _ in range(count - misses)]
+        missing = [max_id + 1 + rng.randrange(1000000) for _ in range(misses)]
+        search_ids = hits + missing
+        rng.shuffle(search_ids)
+        return search_ids
+    
+    @staticmethod
+    def time_method(method: Callable[[int], Any], search_ids: List[int], iterations: int = 1,
+                    repeats: int = 7, warmup: int = 1) -> Dict[str, float]:
+        """
+        Time a lookup method with time.perf_counter_ns over repeated runs.
         
-        # Time dictionary lookup
-        start_time = time.time()
-        for _ in range(iterations):
+        Args:
+            method (Callable): Lookup function taking a transaction ID
+            search_ids (List[int]): IDs looked up in every run
+            iterations (int): Passes over search_ids per run
+            repeats (int): Number of timed runs
+            warmup (int): Untimed runs executed first
+            
+        Returns:
+            Dict[str, float]: Median, IQR, min and max in nanoseconds per lookup
+        """
+        import statistics
+        
+        operations = max(1, len(search_ids) * iterations)
+        for _ in range(warmup):
             for search_id in search_ids:
-                self.dictionary_lookup(search_id)
-        dict_time = time.time() - start_time
+                method(search_id)
+        
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter_ns()
+            for _ in range(iterations):
+                for search_id in search_ids:
+                    method(search_id)
+            samples.append((time.perf_counter_ns() - start) / operations)
+        
+        samples.sort()
+        if len(samples) >= 2:
+            quartiles = statistics.quantiles(samples, n=4)
+            iqr = quartiles[2] - quartiles[0]
+        else:
+            iqr = 0.0
+        return {
+            'median_ns': statistics.median(samples),
+            'iqr_ns': iqr,
+            'min_ns': samples[0],
+            'max_ns': samples[-1],
+            'repeats': repeats,
+            'operations_per_run': operations
+        }
+    
+    def compare_search_efficiency(self, search_ids: List[int], iterations: int = 1000,
+                                  repeats: int = 5, warmup: int = 1) -> Dict[str, Any]:
+        """
+        Compare efficiency of the lookup methods with repeated perf_counter_ns runs.
+        
+        Args:
+            search_ids (List[int]): List of IDs to search for
+            iterations (int): Number of passes over search_ids per timed run
+            repeats (int): Number of timed runs per method (median reported)
+            warmup (int): Untimed warmup runs per method
+            
+        Returns:
+            Dict[str, Any]: Per-method statistics plus the linear vs dictionary summary
+        """
+        results = {name: self.time_method(method, search_ids, iterations, repeats, warmup)
+                   for name, method in self.search_methods().items()}
+        
+        operations = len(search_ids) * iterations
+        linear_time = results['linear_search']['median_ns'] * operations / 1e9
+        dict_time = results['dictionary_lookup']['median_ns'] * operations / 1e9
         
         return {
             'linear_search_time': linear_time,
             'dictionary_lookup_time': dict_time,
             'speedup_factor': linear_time / dict_time if dict_time > 0 else float('inf'),
             'iterations': iterations,
-            'search_operations': len(search_ids) * iterations
+            'search_operations': operations,
+            'methods': results
         }
+    
+    @classmethod
+    def benchmark_scaling(cls, sizes: List[int], lookups: int = 200, miss_rate: float = 0.1,
+                          repeats: int = 5, seed: int = 42) -> Dict[int, Dict[str, Any]]:
+        """
+        Run compare_search_efficiency across synthetic datasets of increasing size.
+        
+        Args:
+            sizes (List[int]): Dataset sizes to generate
+            lookups (int): IDs looked up per run
+            miss_rate (float): Fraction of lookups for IDs that do not exist
+            repeats (int): Timed runs per method
+            seed (int): Random seed
+            
+        Returns:
+            Dict[int, Dict]: compare_search_efficiency results keyed by size
+        """
+        scaling = {}
+        for size in sizes:
+            transactions = [{'id': i, 'type': 'SEND_MONEY', 'amount': float(i)}
+                            for i in range(1, size + 1)]
+            algorithms = cls(transactions, {t['id']: t for t in transactions})
+            search_ids = algorithms.build_search_ids(lookups, miss_rate, seed)
+            scaling[size] = algorithms.compare_search_efficiency(search_ids, iterations=1,
+                                                                 repeats=repeats)
+        return scaling
 
 
 def demonstrate_dsa_comparison():
@@ -162,38 +583,50 @@ def demonstrate_dsa_comparison():
         print(f"\nSearching for Transaction ID: {test_id}")
         
         # Linear search
-        start_time = time.time()
         linear_result = search_algo.linear_search(test_id)
-        linear_time = time.time() - start_time
+        linear_stats = SearchAlgorithms.time_method(search_algo.linear_search, [test_id], iterations=100)
         
         # Dictionary lookup
-        start_time = time.time()
         dict_result = search_algo.dictionary_lookup(test_id)
-        dict_time = time.time() - start_time
+        dict_stats = SearchAlgorithms.time_method(search_algo.dictionary_lookup, [test_id], iterations=100)
         
-        print(f"Linear Search: {'Found' if linear_result else 'Not Found'} (Time: {linear_time:.8f}s)")
-        print(f"Dict Lookup: {'Found' if dict_result else 'Not Found'} (Time: {dict_time:.8f}s)")
+        print(f"Linear Search: {'Found' if linear_result else 'Not Found'} "
+              f"(Median: {linear_stats['median_ns']:.0f} ns)")
+        print(f"Dict Lookup: {'Found' if dict_result else 'Not Found'} "
+              f"(Median: {dict_stats['median_ns']:.0f} ns)")
         
         if linear_result:
             print(f"Transaction: {linear_result['type']} - ${linear_result['amount']}")
     
     # Performance comparison
     print("\n--- Performance Comparison ---")
-    existing_ids = [t['id'] for t in transactions[:20]]  # Use first 20 existing IDs
+    search_ids = search_algo.build_search_ids(20, miss_rate=0.1)  # 10% IDs not present
     
-    results = search_algo.compare_search_efficiency(existing_ids, iterations=100)
+    results = search_algo.compare_search_efficiency(search_ids, iterations=100)
     
-    print(f"Linear Search Time: {results['linear_search_time']:.6f} seconds")
+    print(f"{'Method':<20} {'Median ns/op':>14} {'IQR ns':>10}")
+    for name, stats in results['methods'].items():
+        print(f"{name:<20} {stats['median_ns']:>14.1f} {stats['iqr_ns']:>10.1f}")
+    print(f"\nLinear Search Time: {results['linear_search_time']:.6f} seconds")
     print(f"Dictionary Lookup Time: {results['dictionary_lookup_time']:.6f} seconds")
     print(f"Speedup Factor: {results['speedup_factor']:.2f}x")
     print(f"Operations Performed: {results['search_operations']}")
     
+    print("\n--- Scaling (median ns per lookup, 10% misses) ---")
+    scaling = SearchAlgorithms.benchmark_scaling([1000, 10000, 100000])
+    method_names = list(next(iter(scaling.values()))['methods'])
+    print(f"{'Size':>8} " + ' '.join(f"{name:>18}" for name in method_names))
+    for size, size_results in scaling.items():
+        print(f"{size:>8} " + ' '.join(f"{size_results['methods'][name]['median_ns']:>18.1f}"
+                                       for name in method_names))
+    
     print(f"\n--- Analysis ---")
     print(f"Dictionary lookup is {results['speedup_factor']:.1f}x faster than linear search.")
     print("Why dictionary lookup is faster:")
     print("- Linear Search: O(n) - must check each element sequentially")
     print("- Dictionary Lookup: O(1) average - direct hash-based access")
     print("\nOther efficient data structures:")
+    print("- Binary Search (sorted array / bisect): O(log n) search time")
     print("- Binary Search Tree: O(log n) search time")
     print("- Hash Set: O(1) for existence checks")
     print("- B-Tree: O(log n) but efficient for disk storage")